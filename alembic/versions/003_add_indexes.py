@@ -1,7 +1,7 @@
 """Add indexes for performance optimization
 
 Revision ID: 003
-Revises: 002_add_audit_logs
+Revises: 002
 Create Date: 2024-09-04
 """
 
@@ -9,7 +9,7 @@ from alembic import op
 import sqlalchemy as sa
 
 revision = '003'
-down_revision = '002_add_audit_logs'
+down_revision = '002'
 branch_labels = None
 depends_on = None
 
@@ -22,11 +22,9 @@ def upgrade():
     op.create_index('ix_audit_logs_operation', 'audit_logs', ['operation'])
     op.create_index('ix_audit_logs_record_id', 'audit_logs', ['record_id'])
     
-    # Add composite index for common query pattern
-    op.create_index('ix_audit_logs_table_record', 'audit_logs', ['table_name', 'record_id'])
+    # The composite (table_name, record_id) index is already created by 002
 
 def downgrade():
-    op.drop_index('ix_audit_logs_table_record', 'audit_logs')
     op.drop_index('ix_audit_logs_record_id', 'audit_logs')
     op.drop_index('ix_audit_logs_operation', 'audit_logs')
     op.drop_index('ix_audit_logs_table_name', 'audit_logs')
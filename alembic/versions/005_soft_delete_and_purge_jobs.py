@@ -0,0 +1,53 @@
+"""Soft delete for chemicals and background purge jobs
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('chemicals', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    
+    # CAS numbers stay unique among live chemicals only, so a deleted chemical
+    # can be re-created while its history is still being purged
+    op.drop_constraint('chemicals_cas_number_key', 'chemicals', type_='unique')
+    op.create_index('uq_chemicals_cas_number_live', 'chemicals', ['cas_number'], unique=True,
+                    postgresql_where=sa.text('deleted_at IS NULL'))
+    
+    # create_all at startup may already have built this table on untracked databases
+    if sa.inspect(op.get_bind()).has_table('purge_jobs'):
+        return
+    
+    op.create_table('purge_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('chemical_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), server_default='pending', nullable=False),
+        sa.Column('total_rows', sa.Integer(), nullable=True),
+        sa.Column('deleted_rows', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_purge_jobs_chemical_id'), 'purge_jobs', ['chemical_id'], unique=False)
+    op.create_index(op.f('ix_purge_jobs_status'), 'purge_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_purge_jobs_status'), table_name='purge_jobs')
+    op.drop_index(op.f('ix_purge_jobs_chemical_id'), table_name='purge_jobs')
+    op.drop_table('purge_jobs')
+    op.drop_index('uq_chemicals_cas_number_live', table_name='chemicals')
+    op.create_unique_constraint('chemicals_cas_number_key', 'chemicals', ['cas_number'])
+    op.drop_column('chemicals', 'deleted_at')
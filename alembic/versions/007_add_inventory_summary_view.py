@@ -0,0 +1,73 @@
+"""Materialized view behind the inventory summary report
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Timestamps are appended in order, so a BRIN index serves the 30 day
+    # window of the refresh at almost no cost to inventory log inserts
+    op.create_index('ix_inventory_logs_timestamp_brin', 'inventory_logs', ['timestamp'],
+                    postgresql_using='brin')
+    
+    # One row per live chemical with its movements over the last 7 and 30 days
+    op.execute("""
+        CREATE MATERIALIZED VIEW chemical_activity_summary AS
+        SELECT
+            c.id AS chemical_id,
+            c.name,
+            c.cas_number,
+            c.unit,
+            c.quantity,
+            COALESCE(m.movements_7d, 0) AS movements_7d,
+            COALESCE(m.quantity_moved_7d, 0) AS quantity_moved_7d,
+            COALESCE(m.movements_30d, 0) AS movements_30d,
+            COALESCE(m.quantity_moved_30d, 0) AS quantity_moved_30d
+        FROM chemicals c
+        LEFT JOIN (
+            SELECT
+                chemical_id,
+                COUNT(*) FILTER (WHERE timestamp >= now() - interval '7 days') AS movements_7d,
+                SUM(ABS(quantity)) FILTER (
+                    WHERE timestamp >= now() - interval '7 days' AND action_type IN ('ADD', 'REMOVE')
+                ) AS quantity_moved_7d,
+                COUNT(*) AS movements_30d,
+                SUM(ABS(quantity)) FILTER (WHERE action_type IN ('ADD', 'REMOVE')) AS quantity_moved_30d
+            FROM inventory_logs
+            WHERE timestamp >= now() - interval '30 days'
+            GROUP BY chemical_id
+        ) m ON m.chemical_id = c.id
+        WHERE c.deleted_at IS NULL
+        WITH DATA
+    """)
+    # Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index('ux_chemical_activity_summary_chemical_id', 'chemical_activity_summary',
+                    ['chemical_id'], unique=True)
+    op.create_index('ix_chemical_activity_summary_moved_7d', 'chemical_activity_summary',
+                    [sa.text('quantity_moved_7d DESC')])
+    op.create_index('ix_chemical_activity_summary_moved_30d', 'chemical_activity_summary',
+                    [sa.text('quantity_moved_30d DESC')])
+    
+    op.create_table('report_refreshes',
+        sa.Column('view_name', sa.String(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('duration_ms', sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint('view_name')
+    )
+    op.execute("INSERT INTO report_refreshes (view_name, refreshed_at) VALUES ('chemical_activity_summary', now())")
+
+
+def downgrade() -> None:
+    op.drop_table('report_refreshes')
+    op.execute("DROP MATERIALIZED VIEW chemical_activity_summary")
+    op.drop_index('ix_inventory_logs_timestamp_brin', table_name='inventory_logs')
@@ -0,0 +1,118 @@
+"""Quantities in canonical base units
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+# Snapshot of app.core.units at this revision: every accepted spelling with
+# its base unit and factor. Units outside it are left with NULL base values.
+UNIT_SPELLINGS = [
+    # volume, base ml
+    ('ul', 'ml', 0.001), ('µl', 'ml', 0.001), ('μl', 'ml', 0.001),
+    ('microliter', 'ml', 0.001), ('microlitre', 'ml', 0.001),
+    ('ml', 'ml', 1.0), ('milliliter', 'ml', 1.0), ('millilitre', 'ml', 1.0),
+    ('milliliters', 'ml', 1.0), ('millilitres', 'ml', 1.0), ('cc', 'ml', 1.0),
+    ('l', 'ml', 1000.0), ('liter', 'ml', 1000.0), ('litre', 'ml', 1000.0),
+    ('liters', 'ml', 1000.0), ('litres', 'ml', 1000.0),
+    # mass, base g
+    ('ug', 'g', 0.000001), ('µg', 'g', 0.000001), ('μg', 'g', 0.000001),
+    ('microgram', 'g', 0.000001), ('micrograms', 'g', 0.000001),
+    ('mg', 'g', 0.001), ('milligram', 'g', 0.001), ('milligrams', 'g', 0.001),
+    ('g', 'g', 1.0), ('gram', 'g', 1.0), ('grams', 'g', 1.0),
+    ('kg', 'g', 1000.0), ('kilogram', 'g', 1000.0), ('kilograms', 'g', 1000.0),
+    # amount, base mol
+    ('umol', 'mol', 0.000001), ('µmol', 'mol', 0.000001), ('μmol', 'mol', 0.000001),
+    ('mmol', 'mol', 0.001), ('mol', 'mol', 1.0),
+    # count, base each
+    ('each', 'each', 1.0), ('ea', 'each', 1.0), ('pc', 'each', 1.0), ('pcs', 'each', 1.0),
+    ('piece', 'each', 1.0), ('pieces', 'each', 1.0), ('unit', 'each', 1.0), ('units', 'each', 1.0),
+]
+
+SUMMARY_VIEW_SQL = """
+    CREATE MATERIALIZED VIEW chemical_activity_summary AS
+    SELECT
+        c.id AS chemical_id,
+        c.name,
+        c.cas_number,
+        c.unit,
+        c.quantity,{base_columns}
+        COALESCE(m.movements_7d, 0) AS movements_7d,
+        COALESCE(m.quantity_moved_7d, 0) AS quantity_moved_7d,
+        COALESCE(m.movements_30d, 0) AS movements_30d,
+        COALESCE(m.quantity_moved_30d, 0) AS quantity_moved_30d
+    FROM chemicals c
+    LEFT JOIN (
+        SELECT
+            chemical_id,
+            COUNT(*) FILTER (WHERE timestamp >= now() - interval '7 days') AS movements_7d,
+            SUM(ABS({moved})) FILTER (
+                WHERE timestamp >= now() - interval '7 days' AND action_type IN ('ADD', 'REMOVE')
+            ) AS quantity_moved_7d,
+            COUNT(*) AS movements_30d,
+            SUM(ABS({moved})) FILTER (WHERE action_type IN ('ADD', 'REMOVE')) AS quantity_moved_30d
+        FROM inventory_logs
+        WHERE timestamp >= now() - interval '30 days'
+        GROUP BY chemical_id
+    ) m ON m.chemical_id = c.id
+    WHERE c.deleted_at IS NULL
+    WITH DATA
+"""
+
+
+def create_summary_view(moved: str, base_columns: str = "") -> None:
+    op.execute(SUMMARY_VIEW_SQL.format(moved=moved, base_columns=base_columns))
+    # Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index('ux_chemical_activity_summary_chemical_id', 'chemical_activity_summary',
+                    ['chemical_id'], unique=True)
+    op.create_index('ix_chemical_activity_summary_moved_7d', 'chemical_activity_summary',
+                    [sa.text('quantity_moved_7d DESC')])
+    op.create_index('ix_chemical_activity_summary_moved_30d', 'chemical_activity_summary',
+                    [sa.text('quantity_moved_30d DESC')])
+
+
+def upgrade() -> None:
+    op.add_column('chemicals', sa.Column('base_quantity', sa.Float(), nullable=True))
+    op.add_column('chemicals', sa.Column('base_unit', sa.String(), nullable=True))
+    op.add_column('inventory_logs', sa.Column('base_quantity', sa.Float(), nullable=True))
+
+    units = ", ".join(f"('{spelling}', '{base_unit}', {factor!r})" for spelling, base_unit, factor in UNIT_SPELLINGS)
+    op.execute(f"""
+        UPDATE chemicals AS c
+        SET base_quantity = c.quantity * u.factor, base_unit = u.base_unit
+        FROM (VALUES {units}) AS u(unit, base_unit, factor)
+        WHERE lower(trim(c.unit)) = u.unit
+    """)
+    op.execute(f"""
+        UPDATE inventory_logs AS l
+        SET base_quantity = l.quantity * u.factor
+        FROM chemicals c, (VALUES {units}) AS u(unit, base_unit, factor)
+        WHERE c.id = l.chemical_id AND lower(trim(c.unit)) = u.unit
+    """)
+
+    op.create_index('ix_chemicals_base_unit_quantity', 'chemicals', ['base_unit', 'base_quantity'],
+                    postgresql_where=sa.text('deleted_at IS NULL'))
+
+    # Moved quantities are summed in base units so they compare across chemicals
+    op.execute("DROP MATERIALIZED VIEW chemical_activity_summary")
+    create_summary_view(
+        moved="COALESCE(base_quantity, quantity)",
+        base_columns="\n        c.base_unit,\n        c.base_quantity,"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW chemical_activity_summary")
+    create_summary_view(moved="quantity")
+    op.drop_index('ix_chemicals_base_unit_quantity', table_name='chemicals')
+    op.drop_column('inventory_logs', 'base_quantity')
+    op.drop_column('chemicals', 'base_unit')
+    op.drop_column('chemicals', 'base_quantity')
@@ -0,0 +1,61 @@
+"""Consolidate indexes around the endpoint queries
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns) built so that each paginated endpoint walks an index
+# in ORDER BY order instead of sorting every matching row
+COMPOSITE_INDEXES = [
+    # GET /chemicals/{id}/logs and the purge worker's chunked deletes
+    ('ix_inventory_logs_chemical_timestamp', 'inventory_logs', ['chemical_id', sa.text('timestamp DESC')]),
+    # GET /audit/logs with table_name (and operation)
+    ('ix_audit_logs_table_operation_timestamp', 'audit_logs',
+     ['table_name', 'operation', sa.text('timestamp DESC')]),
+    # GET /audit/logs/record/{id}
+    ('ix_audit_logs_record_timestamp', 'audit_logs', ['record_id', sa.text('timestamp DESC')]),
+    # GET /audit/logs without filters, and operation-only filters
+    ('ix_audit_logs_timestamp', 'audit_logs', [sa.text('timestamp DESC')]),
+]
+
+# Duplicates of a primary key, or prefixes of a composite index above. Every
+# one of them is maintained on each insert without serving a query of its own.
+REDUNDANT_INDEXES = [
+    ('ix_chemicals_id', 'chemicals', ['id']),
+    ('ix_inventory_logs_id', 'inventory_logs', ['id']),
+    ('ix_inventory_logs_chemical_id', 'inventory_logs', ['chemical_id']),
+    ('ix_audit_logs_id', 'audit_logs', ['id']),
+    ('ix_audit_logs_table_name', 'audit_logs', ['table_name']),
+    ('ix_audit_logs_operation', 'audit_logs', ['operation']),
+    ('ix_audit_logs_record_id', 'audit_logs', ['record_id']),
+    ('ix_audit_logs_table_record', 'audit_logs', ['table_name', 'record_id']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; it keeps the tables
+    # writable while large indexes build. IF [NOT] EXISTS makes a rerun after
+    # an interruption safe (an interrupted concurrent build leaves an invalid
+    # index behind that must be dropped by hand).
+    with op.get_context().autocommit_block():
+        for name, table, columns in COMPOSITE_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in COMPOSITE_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -1,11 +1,13 @@
+import asyncio
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import Optional
-import math
-from app.db.session import get_db
+from app.db.replicas import get_read_db
 from app.models import AuditLog
 from app.api import schemas
+from app.api.pagination import normalize_pagination, build_page
+from app.services.audit_archive import audit_archive
 
 router = APIRouter(prefix="/audit", tags=["audit"])
 
@@ -15,16 +17,9 @@ async def get_audit_logs(
     operation: Optional[str] = None,
     page: int = 1,
     page_size: int = 10,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    if page < 1:
-        page = 1
-    if page_size < 1:
-        page_size = 10
-    if page_size > 100:
-        page_size = 100
-    
-    skip = (page - 1) * page_size
+    page, page_size, skip = normalize_pagination(page, page_size)
     
     # Build query
     query = select(AuditLog)
@@ -46,58 +41,61 @@ async def get_audit_logs(
     result = await db.execute(query)
     logs = result.scalars().all()
     
-    total_pages = math.ceil(total_count / page_size) if total_count > 0 else 0
-    
-    return {
-        "items": logs,
-        "total_count": total_count,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": total_pages,
-        "has_next": page < total_pages,
-        "has_previous": page > 1
-    }
+    return build_page(logs, total_count, page, page_size)
 
 @router.get("/logs/record/{record_id}", response_model=schemas.PaginatedResponse[schemas.AuditLog])
 async def get_audit_logs_by_record(
     record_id: int,
     page: int = 1,
     page_size: int = 10,
-    db: AsyncSession = Depends(get_db)
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    if page < 1:
-        page = 1
-    if page_size < 1:
-        page_size = 10
-    if page_size > 100:
-        page_size = 100
-    
-    skip = (page - 1) * page_size
+    """Audit history of one record, newest first; include_archived appends rows moved to the cold tier"""
+    page, page_size, skip = normalize_pagination(page, page_size)
     
     # Get total count
     count_result = await db.execute(
         select(func.count(AuditLog.id)).where(AuditLog.record_id == record_id)
     )
-    total_count = count_result.scalar() or 0
+    hot_count = count_result.scalar() or 0
     
-    # Get logs
-    result = await db.execute(
-        select(AuditLog)
-        .where(AuditLog.record_id == record_id)
-        .order_by(AuditLog.timestamp.desc())
-        .offset(skip)
-        .limit(page_size)
-    )
-    logs = result.scalars().all()
+    # Archived rows are older than every row still in the table, so they follow it.
+    # The count comes from the record's posting list; files are read only for a
+    # page that reaches past the table's rows
+    archived_count = 0
+    still_hot = set()
+    if include_archived:
+        archived_count = await asyncio.to_thread(audit_archive.count_for_record, record_id)
+    if archived_count:
+        # Rows whose archiving DELETE failed to commit are in both places until the
+        # next run; the table's copy wins. Normally no table row is this old
+        old_rows = await db.execute(
+            select(AuditLog.id).where(
+                AuditLog.record_id == record_id,
+                AuditLog.timestamp <= audit_archive.newest_timestamp()
+            )
+        )
+        old_ids = set(old_rows.scalars().all())
+        if old_ids:
+            still_hot = old_ids & await asyncio.to_thread(audit_archive.ids_for_record, record_id)
+            archived_count -= len(still_hot)
+    total_count = hot_count + archived_count
     
-    total_pages = math.ceil(total_count / page_size) if total_count > 0 else 0
+    # Get logs
+    logs = []
+    if skip < hot_count:
+        result = await db.execute(
+            select(AuditLog)
+            .where(AuditLog.record_id == record_id)
+            .order_by(AuditLog.timestamp.desc())
+            .offset(skip)
+            .limit(page_size)
+        )
+        logs = list(result.scalars().all())
+    if len(logs) < page_size and archived_count:
+        logs.extend(await asyncio.to_thread(
+            audit_archive.rows_for_record, record_id, max(skip - hot_count, 0), page_size - len(logs), still_hot
+        ))
     
-    return {
-        "items": logs,
-        "total_count": total_count,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": total_pages,
-        "has_next": page < total_pages,
-        "has_previous": page > 1
-    }
\ No newline at end of file
+    return build_page(logs, total_count, page, page_size)
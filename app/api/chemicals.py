@@ -1,22 +1,178 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, func
-from typing import List
+from sqlalchemy import select, func, text
+from sqlalchemy.exc import IntegrityError
+from collections import Counter
+from typing import List, Optional
 import asyncpg
-import math
-from app.db.session import get_db, get_asyncpg_connection
-from app.models import Chemical, InventoryLog
+from app.db.session import get_db
+from app.db.replicas import get_read_db, get_read_asyncpg_connection
+from app.models import Chemical, InventoryLog, PurgeJob
 from app.api import schemas
+from app.api.pagination import normalize_pagination, build_page
 from app.services.audit_service import AuditService
+from app.services.idempotency import idempotency
+from app.services.log_batcher import log_batcher
+from app.services.purge_worker import purge_worker
+from app.core.config import settings
+from app.core.units import lookup, to_base, sql_factor, sql_base_unit
 
 router = APIRouter(prefix="/chemicals", tags=["chemicals"])
 
+CHEMICAL_COLUMNS = (
+    "id", "name", "cas_number", "quantity", "unit", "base_quantity", "base_unit", "created_at", "updated_at", "version"
+)
+UPDATABLE_FIELDS = ("name", "cas_number", "quantity", "unit")
+
+# Hot asyncpg read queries; also prepared on each pooled connection at warm-up
+READ_CHEMICAL_SQL = """
+    SELECT id, name, cas_number, quantity, unit, base_quantity, base_unit, created_at, updated_at, version
+    FROM chemicals
+    WHERE id = $1 AND deleted_at IS NULL
+"""
+# Multi-get: a BitmapOr over the primary key and the live cas_number unique index
+LOOKUP_CHEMICALS_SQL = """
+    SELECT id, name, cas_number, quantity, unit, base_quantity, base_unit, created_at, updated_at, version
+    FROM chemicals
+    WHERE (id = ANY($1::integer[]) OR cas_number = ANY($2::text[])) AND deleted_at IS NULL
+"""
+CHEMICAL_EXISTS_SQL = "SELECT 1 FROM chemicals WHERE id = $1 AND deleted_at IS NULL"
+COUNT_LOGS_SQL = "SELECT COUNT(*) FROM inventory_logs WHERE chemical_id = $1"
+READ_LOGS_SQL = """
+    SELECT id, chemical_id, action_type::text as action_type, quantity, timestamp
+    FROM inventory_logs
+    WHERE chemical_id = $1
+    ORDER BY timestamp DESC
+    LIMIT $2 OFFSET $3
+"""
+
+# Lock the live row, update it only if its version is one the client sent in
+# If-Match (or unconditionally without the header) and return the row as it was
+# and as it is now. A missing row yields no result; a version mismatch yields
+# the old row with NULL new columns. The base columns follow quantity and unit
+# through the registry's CASE expressions (see app.core.units).
+UPDATE_SQL = text(f"""
+    WITH old AS (
+        SELECT {", ".join(CHEMICAL_COLUMNS)}
+        FROM chemicals
+        WHERE id = :id AND deleted_at IS NULL
+        FOR UPDATE
+    ),
+    new AS (
+        UPDATE chemicals AS c SET
+            name = COALESCE(CAST(:name AS text), c.name),
+            cas_number = COALESCE(CAST(:cas_number AS text), c.cas_number),
+            quantity = COALESCE(CAST(:quantity AS double precision), c.quantity),
+            unit = COALESCE(CAST(:unit AS text), c.unit),
+            base_quantity = COALESCE(CAST(:quantity AS double precision), c.quantity)
+                * {sql_factor("COALESCE(CAST(:unit AS text), c.unit)")},
+            base_unit = {sql_base_unit("COALESCE(CAST(:unit AS text), c.unit)")},
+            version = c.version + 1,
+            updated_at = now()
+        FROM old
+        WHERE c.id = old.id
+          AND (CAST(:expected_versions AS integer[]) IS NULL
+               OR old.version = ANY(CAST(:expected_versions AS integer[])))
+        RETURNING {", ".join(f"c.{column}" for column in CHEMICAL_COLUMNS)}
+    )
+    SELECT
+        {", ".join(f"old.{column} AS old_{column}" for column in CHEMICAL_COLUMNS)},
+        {", ".join(f"new.{column}" for column in CHEMICAL_COLUMNS)}
+    FROM old LEFT JOIN new ON true
+""")
+
+# One statement for the whole list: lock the live target rows in id order, then
+# update them from the unnested arrays and return each row before and after.
+# NULL in an array means "leave the column unchanged".
+BULK_UPDATE_SQL = text(f"""
+    WITH v AS (
+        SELECT * FROM unnest(
+            CAST(:ids AS integer[]),
+            CAST(:names AS text[]),
+            CAST(:cas_numbers AS text[]),
+            CAST(:quantities AS double precision[]),
+            CAST(:units AS text[])
+        ) AS v(id, name, cas_number, quantity, unit)
+    ),
+    old AS (
+        SELECT {", ".join(f"c.{column}" for column in CHEMICAL_COLUMNS)}
+        FROM chemicals c JOIN v ON v.id = c.id
+        WHERE c.deleted_at IS NULL
+        ORDER BY c.id
+        FOR UPDATE OF c
+    )
+    UPDATE chemicals AS c SET
+        name = COALESCE(v.name, c.name),
+        cas_number = COALESCE(v.cas_number, c.cas_number),
+        quantity = COALESCE(v.quantity, c.quantity),
+        unit = COALESCE(v.unit, c.unit),
+        base_quantity = COALESCE(v.quantity, c.quantity) * {sql_factor("COALESCE(v.unit, c.unit)")},
+        base_unit = {sql_base_unit("COALESCE(v.unit, c.unit)")},
+        version = c.version + 1,
+        updated_at = now()
+    FROM v JOIN old ON old.id = v.id
+    WHERE c.id = v.id
+    RETURNING
+        {", ".join(f"c.{column}" for column in CHEMICAL_COLUMNS)},
+        {", ".join(f"old.{column} AS old_{column}" for column in CHEMICAL_COLUMNS[1:])}
+""")
+
+
+def normalize_log_rows(rows) -> List[dict]:
+    """Convert inventory_logs rows to dicts with the lowercase ActionType values"""
+    logs = []
+    for row in rows:
+        log_dict = dict(row)
+        if log_dict.get('action_type'):
+            log_dict['action_type'] = log_dict['action_type'].lower()
+        logs.append(log_dict)
+    return logs
+
+
+def format_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def parse_if_match(value: Optional[str]) -> Optional[List[int]]:
+    """Versions listed in an If-Match header; None when any version is acceptable"""
+    if value is None or value.strip() == "*":
+        return None
+    versions = []
+    for tag in value.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        try:
+            versions.append(int(tag.strip('"')))
+        except ValueError:
+            # Not one of our ETags, so it can never match
+            continue
+    return versions
+
+
 @router.post("/", response_model=schemas.Chemical)
 async def create_chemical(
     chemical: schemas.ChemicalCreate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
-    db_chemical = Chemical(**chemical.dict())
+    if idempotency_key is None:
+        db_chemical = await _create_chemical(chemical, db)
+        await db.commit()
+        return db_chemical
+    return await idempotency.execute(
+        idempotency_key,
+        scope="POST /chemicals/",
+        payload=chemical,
+        db=db,
+        handler=lambda: _create_chemical(chemical, db),
+        response_model=schemas.Chemical
+    )
+
+async def _create_chemical(chemical: schemas.ChemicalCreate, db: AsyncSession):
+    """Insert the chemical and its audit row; the caller commits"""
+    base_quantity, base_unit = to_base(chemical.quantity, chemical.unit)
+    db_chemical = Chemical(**chemical.dict(), base_quantity=base_quantity, base_unit=base_unit)
     db.add(db_chemical)
     await db.flush()
     
@@ -31,58 +187,113 @@ async def create_chemical(
     except Exception:
         pass
     
-    await db.commit()
     await db.refresh(db_chemical)
     return db_chemical
 
+def check_lookup_size(count: int):
+    if count > settings.LOOKUP_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.LOOKUP_MAX_ITEMS} ids and CAS numbers can be looked up at once"
+        )
+
+
+def parse_id_list(value: str) -> List[int]:
+    try:
+        return [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids must be a comma-separated list of integers"
+        )
+
+
+async def fetch_chemicals(conn: asyncpg.Connection, ids: List[int], cas_numbers: List[str]) -> dict:
+    """Resolve ids and CAS numbers with one query; items follow the request order"""
+    ids = list(dict.fromkeys(ids))
+    cas_numbers = list(dict.fromkeys(cas_numbers))
+    rows = await conn.fetch(LOOKUP_CHEMICALS_SQL, ids, cas_numbers)
+    
+    by_id = {row["id"]: dict(row) for row in rows}
+    by_cas = {row["cas_number"]: row["id"] for row in rows}
+    found = [chemical_id for chemical_id in ids if chemical_id in by_id]
+    found += [by_cas[cas_number] for cas_number in cas_numbers if cas_number in by_cas]
+    return {
+        "items": [by_id[chemical_id] for chemical_id in dict.fromkeys(found)],
+        "missing_ids": [chemical_id for chemical_id in ids if chemical_id not in by_id],
+        "missing_cas_numbers": [cas_number for cas_number in cas_numbers if cas_number not in by_cas]
+    }
+
+
 @router.get("/", response_model=schemas.PaginatedResponse[schemas.Chemical])
 async def read_chemicals(
     page: int = 1,
     page_size: int = 10,
-    db: AsyncSession = Depends(get_db)
+    min_quantity: Optional[float] = None,
+    max_quantity: Optional[float] = None,
+    quantity_unit: Optional[str] = None,
+    ids: Optional[str] = Query(None, description="Comma-separated ids to fetch as a single page"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    if page < 1:
-        page = 1
-    if page_size < 1:
-        page_size = 10
-    if page_size > 100:
-        page_size = 100
+    if ids is not None:
+        # Same response shape as the list, holding every found chemical in
+        # request order; POST /lookup also reports which ones are missing
+        id_list = parse_id_list(ids)
+        check_lookup_size(len(id_list))
+        conn = (await (await db.connection()).get_raw_connection()).driver_connection
+        items = (await fetch_chemicals(conn, id_list, []))["items"]
+        return build_page(items, len(items), 1, max(len(items), 1))
+    
+    page, page_size, skip = normalize_pagination(page, page_size)
+    filters = [Chemical.deleted_at.is_(None)]
     
-    skip = (page - 1) * page_size
+    if min_quantity is not None or max_quantity is not None:
+        # Ranges are compared in base units, so 1 l matches min_quantity=500&quantity_unit=ml
+        unit = lookup(quantity_unit)
+        if unit is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="quantity_unit must be a known unit when filtering by quantity"
+            )
+        filters.append(Chemical.base_unit == unit.base_unit)
+        if min_quantity is not None:
+            filters.append(Chemical.base_quantity >= min_quantity * unit.factor)
+        if max_quantity is not None:
+            filters.append(Chemical.base_quantity <= max_quantity * unit.factor)
     
     # Get total count
-    count_result = await db.execute(select(func.count(Chemical.id)))
+    count_result = await db.execute(
+        select(func.count(Chemical.id)).where(*filters)
+    )
     total_count = count_result.scalar()
     
     # Get chemicals
     result = await db.execute(
-        select(Chemical).offset(skip).limit(page_size)
+        select(Chemical).where(*filters).offset(skip).limit(page_size)
     )
     chemicals = result.scalars().all()
     
-    total_pages = math.ceil(total_count / page_size) if total_count > 0 else 0
-    
-    return {
-        "items": chemicals,
-        "total_count": total_count,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": total_pages,
-        "has_next": page < total_pages,
-        "has_previous": page > 1
-    }
+    return build_page(chemicals, total_count, page, page_size)
+
+@router.post("/lookup", response_model=schemas.ChemicalLookupResult)
+async def lookup_chemicals(
+    request: Request,
+    body: schemas.ChemicalLookup,
+    conn: asyncpg.Connection = Depends(get_read_asyncpg_connection)
+):
+    """Fetch many chemicals by id and/or CAS number in one round trip"""
+    # A read sent as POST for the size of its body: no consistency token needed
+    request.state.read_only = True
+    check_lookup_size(len(body.ids) + len(body.cas_numbers))
+    return await fetch_chemicals(conn, body.ids, body.cas_numbers)
 
 @router.get("/{chemical_id}", response_model=schemas.Chemical)
 async def read_chemical(
     chemical_id: int,
-    conn: asyncpg.Connection = Depends(get_asyncpg_connection)
+    response: Response,
+    conn: asyncpg.Connection = Depends(get_read_asyncpg_connection)
 ):
-    query = """
-        SELECT id, name, cas_number, quantity, unit, created_at, updated_at
-        FROM chemicals
-        WHERE id = $1
-    """
-    row = await conn.fetchrow(query, chemical_id)
+    row = await conn.fetchrow(READ_CHEMICAL_SQL, chemical_id)
     
     if row is None:
         raise HTTPException(
@@ -90,32 +301,40 @@ async def read_chemical(
             detail=f"Chemical with id {chemical_id} not found"
         )
     
+    response.headers["ETag"] = format_etag(row["version"])
     return dict(row)
 
 @router.put("/{chemical_id}", response_model=schemas.Chemical)
 async def update_chemical(
     chemical_id: int,
     chemical_update: schemas.ChemicalUpdate,
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    if_match: Optional[str] = Header(None, alias="If-Match")
 ):
-    result = await db.execute(
-        select(Chemical).where(Chemical.id == chemical_id)
-    )
-    db_chemical = result.scalar_one_or_none()
+    update_data = chemical_update.dict(exclude_unset=True)
+    result = await db.execute(UPDATE_SQL, {
+        "id": chemical_id,
+        "expected_versions": parse_if_match(if_match),
+        **{field: update_data.get(field) for field in UPDATABLE_FIELDS}
+    })
+    row = result.mappings().one_or_none()
     
-    if db_chemical is None:
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Chemical with id {chemical_id} not found"
         )
     
-    old_values = AuditService.serialize_model(db_chemical)
-    
-    update_data = chemical_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_chemical, field, value)
+    if row["id"] is None:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"Chemical with id {chemical_id} was modified; current version is {row['old_version']}",
+            headers={"ETag": format_etag(row["old_version"])}
+        )
     
-    await db.flush()
+    new_values = {column: row[column] for column in CHEMICAL_COLUMNS}
     
     try:
         await AuditService.log_operation(
@@ -123,23 +342,137 @@ async def update_chemical(
             table_name="chemicals",
             operation="UPDATE",
             record_id=chemical_id,
-            old_values=old_values,
-            new_values=AuditService.serialize_model(db_chemical)
+            old_values=AuditService.serialize_row({column: row[f"old_{column}"] for column in CHEMICAL_COLUMNS}),
+            new_values=AuditService.serialize_row(new_values)
         )
     except Exception:
         pass
     
     await db.commit()
-    await db.refresh(db_chemical)
-    return db_chemical
+    response.headers["ETag"] = format_etag(new_values["version"])
+    return new_values
+
+@router.patch("/bulk", response_model=schemas.ChemicalBulkUpdateResult)
+async def bulk_update_chemicals(
+    bulk_update: schemas.ChemicalBulkUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Apply partial updates to many chemicals with one UPDATE and one audit batch"""
+    items = bulk_update.items
+    if not items or len(items) > settings.BULK_UPDATE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"items must contain 1 to {settings.BULK_UPDATE_MAX_ITEMS} entries"
+        )
+    
+    id_counts = Counter(item.id for item in items)
+    duplicates = sorted(chemical_id for chemical_id, count in id_counts.items() if count > 1)
+    if duplicates:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Each chemical may appear only once; repeated ids: {duplicates}"
+        )
+    
+    conflicts = await _find_cas_conflicts(items, db)
+    conflicted = {conflict.id for conflict in conflicts}
+    to_apply = [item for item in items if item.id not in conflicted]
+    
+    rows = []
+    if to_apply:
+        try:
+            result = await db.execute(BULK_UPDATE_SQL, {
+                "ids": [item.id for item in to_apply],
+                "names": [item.name for item in to_apply],
+                "cas_numbers": [item.cas_number for item in to_apply],
+                "quantities": [item.quantity for item in to_apply],
+                "units": [item.unit for item in to_apply]
+            })
+            rows = [dict(row._mapping) for row in result]
+        except IntegrityError:
+            # A concurrent write claimed one of the CAS numbers after the pre-check
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A cas_number in the request is already in use; no chemicals were updated"
+            )
+    
+    if rows:
+        try:
+            await AuditService.log_operations(
+                db=db,
+                table_name="chemicals",
+                operation="UPDATE",
+                entries=[
+                    (
+                        row["id"],
+                        AuditService.serialize_row(
+                            {"id": row["id"], **{column: row[f"old_{column}"] for column in CHEMICAL_COLUMNS[1:]}}
+                        ),
+                        AuditService.serialize_row({column: row[column] for column in CHEMICAL_COLUMNS})
+                    )
+                    for row in rows
+                ]
+            )
+        except Exception:
+            pass
+        
+        await db.commit()
+    
+    updated = {row["id"]: {column: row[column] for column in CHEMICAL_COLUMNS} for row in rows}
+    return {
+        "updated": [updated[item.id] for item in to_apply if item.id in updated],
+        "not_found": [item.id for item in to_apply if item.id not in updated],
+        "conflicts": conflicts
+    }
+
+async def _find_cas_conflicts(
+    items: List[schemas.ChemicalBulkUpdateItem],
+    db: AsyncSession
+) -> List[schemas.ChemicalBulkConflict]:
+    """Items whose new cas_number is repeated in the request or held by another live chemical"""
+    targets = {}
+    for item in items:
+        if item.cas_number is not None:
+            targets.setdefault(item.cas_number, []).append(item.id)
+    if not targets:
+        return []
+    
+    conflicts = {}
+    for cas_number, chemical_ids in targets.items():
+        if len(chemical_ids) > 1:
+            for chemical_id in chemical_ids:
+                conflicts[chemical_id] = schemas.ChemicalBulkConflict(
+                    id=chemical_id,
+                    field="cas_number",
+                    detail=f"cas_number {cas_number} is requested for more than one chemical"
+                )
+    
+    result = await db.execute(
+        select(Chemical.id, Chemical.cas_number).where(
+            Chemical.cas_number.in_(targets),
+            Chemical.deleted_at.is_(None)
+        )
+    )
+    for holder_id, cas_number in result.all():
+        for chemical_id in targets[cas_number]:
+            if chemical_id != holder_id and chemical_id not in conflicts:
+                conflicts[chemical_id] = schemas.ChemicalBulkConflict(
+                    id=chemical_id,
+                    field="cas_number",
+                    detail=f"cas_number {cas_number} is already used by chemical {holder_id}"
+                )
+    
+    return [conflicts[item.id] for item in items if item.id in conflicts]
 
 @router.delete("/{chemical_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_chemical(
     chemical_id: int,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
+    """Tombstone the chemical now; its inventory history is purged by a background job"""
     result = await db.execute(
-        select(Chemical).where(Chemical.id == chemical_id)
+        select(Chemical).where(Chemical.id == chemical_id, Chemical.deleted_at.is_(None))
     )
     db_chemical = result.scalar_one_or_none()
     
@@ -151,9 +484,7 @@ async def delete_chemical(
     
     old_values = AuditService.serialize_model(db_chemical)
     
-    await db.execute(
-        delete(InventoryLog).where(InventoryLog.chemical_id == chemical_id)
-    )
+    db_chemical.deleted_at = func.now()
     
     try:
         await AuditService.log_operation(
@@ -166,19 +497,41 @@ async def delete_chemical(
     except Exception:
         pass
     
-    await db.execute(
-        delete(Chemical).where(Chemical.id == chemical_id)
-    )
+    purge_job = PurgeJob(chemical_id=chemical_id)
+    db.add(purge_job)
+    await db.flush()
     await db.commit()
+    
+    purge_worker.wake()
+    response.headers["Location"] = f"/api/v1/jobs/purge/{purge_job.id}"
 
 @router.post("/{chemical_id}/log", response_model=schemas.InventoryLog)
 async def create_inventory_log(
     chemical_id: int,
     log_entry: schemas.InventoryLogCreate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
+    if idempotency_key is None:
+        if settings.INVENTORY_LOG_BATCHING:
+            return await log_batcher.submit(chemical_id, log_entry)
+        db_log = await _create_inventory_log(chemical_id, log_entry, db)
+        await db.commit()
+        return db_log
+    # Not batched: the key has to commit in the same transaction as the log
+    return await idempotency.execute(
+        idempotency_key,
+        scope="POST /chemicals/{chemical_id}/log",
+        payload={"chemical_id": chemical_id, "log_entry": log_entry},
+        db=db,
+        handler=lambda: _create_inventory_log(chemical_id, log_entry, db),
+        response_model=schemas.InventoryLog
+    )
+
+async def _create_inventory_log(chemical_id: int, log_entry: schemas.InventoryLogCreate, db: AsyncSession):
+    """Insert the log and its audit row; the caller commits"""
     result = await db.execute(
-        select(Chemical).where(Chemical.id == chemical_id)
+        select(Chemical).where(Chemical.id == chemical_id, Chemical.deleted_at.is_(None))
     )
     db_chemical = result.scalar_one_or_none()
     
@@ -188,12 +541,26 @@ async def create_inventory_log(
             detail=f"Chemical with id {chemical_id} not found"
         )
     
+    base_quantity, _ = to_base(log_entry.quantity, db_chemical.unit)
     db_log = InventoryLog(
         chemical_id=chemical_id,
+        base_quantity=base_quantity,
         **log_entry.dict()
     )
     db.add(db_log)
-    await db.commit()
+    await db.flush()
+    
+    try:
+        await AuditService.log_operation(
+            db=db,
+            table_name="inventory_logs",
+            operation="CREATE",
+            record_id=db_log.id,
+            new_values=AuditService.serialize_model(db_log)
+        )
+    except Exception:
+        pass
+    
     await db.refresh(db_log)
     return db_log
 
@@ -202,22 +569,12 @@ async def read_inventory_logs(
     chemical_id: int,
     page: int = 1,
     page_size: int = 10,
-    conn: asyncpg.Connection = Depends(get_asyncpg_connection)
+    conn: asyncpg.Connection = Depends(get_read_asyncpg_connection)
 ):
-    if page < 1:
-        page = 1
-    if page_size < 1:
-        page_size = 10
-    if page_size > 100:
-        page_size = 100
-    
-    skip = (page - 1) * page_size
+    page, page_size, skip = normalize_pagination(page, page_size)
     
     # Check if chemical exists
-    chemical_exists = await conn.fetchrow(
-        "SELECT 1 FROM chemicals WHERE id = $1",
-        chemical_id
-    )
+    chemical_exists = await conn.fetchrow(CHEMICAL_EXISTS_SQL, chemical_id)
     if chemical_exists is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -225,37 +582,12 @@ async def read_inventory_logs(
         )
     
     # Get total count
-    count_result = await conn.fetchval(
-        "SELECT COUNT(*) FROM inventory_logs WHERE chemical_id = $1",
-        chemical_id
-    )
+    count_result = await conn.fetchval(COUNT_LOGS_SQL, chemical_id)
     total_count = count_result or 0
     
     # Get logs with pagination
-    query = """
-        SELECT id, chemical_id, action_type::text as action_type, quantity, timestamp
-        FROM inventory_logs
-        WHERE chemical_id = $1
-        ORDER BY timestamp DESC
-        LIMIT $2 OFFSET $3
-    """
-    rows = await conn.fetch(query, chemical_id, page_size, skip)
-    
-    logs = []
-    for row in rows:
-        log_dict = dict(row)
-        if log_dict.get('action_type'):
-            log_dict['action_type'] = log_dict['action_type'].lower()
-        logs.append(log_dict)
+    rows = await conn.fetch(READ_LOGS_SQL, chemical_id, page_size, skip)
     
-    total_pages = math.ceil(total_count / page_size) if total_count > 0 else 0
+    logs = normalize_log_rows(rows)
     
-    return {
-        "items": logs,
-        "total_count": total_count,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": total_pages,
-        "has_next": page < total_pages,
-        "has_previous": page > 1
-    }
+    return build_page(logs, total_count, page, page_size)
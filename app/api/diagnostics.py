@@ -0,0 +1,51 @@
+import asyncio
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from app.core.config import settings
+from app.core.diagnostics import profiler, loop_lag_monitor, allocation_tracker, render_collapsed
+
+
+def require_admin(admin_token: Optional[str] = Header(None, alias="X-Admin-Token")):
+    # Without a configured token nobody is an admin
+    if not settings.ADMIN_TOKEN or admin_token is None or not secrets.compare_digest(admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required")
+
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"], dependencies=[Depends(require_admin)])
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(10, gt=0, le=120),
+    interval_ms: float = Query(5, ge=1, le=1000)
+):
+    """Sample this worker's event-loop thread; collapsed stacks, one 'frame;frame;... count' per line"""
+    if profiler.busy:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already running in this worker")
+    try:
+        stacks = await profiler.profile(seconds, interval_ms / 1000)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return PlainTextResponse(render_collapsed(stacks))
+
+@router.get("/loop-lag")
+async def loop_lag():
+    return loop_lag_monitor.stats()
+
+@router.post("/allocations/start")
+async def start_allocation_tracing(frames: int = Query(1, ge=1, le=50)):
+    """Start tracemalloc (frames kept per allocation) and reset the per-endpoint totals"""
+    allocation_tracker.start(frames)
+    return {"tracing": True, "frames": frames}
+
+@router.post("/allocations/stop")
+async def stop_allocation_tracing():
+    allocation_tracker.stop()
+    return {"tracing": False}
+
+@router.get("/allocations")
+async def allocations(limit: int = Query(20, ge=1, le=200)):
+    """Net allocation per endpoint since tracing started, and the largest live allocation sites"""
+    # Snapshot statistics are CPU bound; keep them off the event loop
+    return await asyncio.to_thread(allocation_tracker.report, limit)
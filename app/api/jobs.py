@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.db.session import get_db
+from app.models import PurgeJob
+from app.api import schemas
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+@router.get("/purge/{job_id}", response_model=schemas.PurgeJob)
+async def read_purge_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    result = await db.execute(
+        select(PurgeJob).where(PurgeJob.id == job_id)
+    )
+    job = result.scalar_one_or_none()
+    
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Purge job with id {job_id} not found"
+        )
+    
+    response = schemas.PurgeJob.model_validate(job)
+    if job.status == "completed":
+        response.progress = 100.0
+    elif job.total_rows:
+        response.progress = round(min(job.deleted_rows / job.total_rows, 1.0) * 100, 1)
+    elif job.total_rows == 0:
+        response.progress = 0.0
+    return response
\ No newline at end of file
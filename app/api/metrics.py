@@ -0,0 +1,39 @@
+from fastapi import APIRouter
+from app.core.logging_config import get_logging_stats
+from app.core.audit_sink import get_audit_sink
+from app.core.admission import admission
+from app.db.replicas import replica_router
+from app.services.audit_archive import audit_archiver
+from app.services.log_batcher import log_batcher
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("/logging")
+async def logging_metrics():
+    return get_logging_stats()
+
+@router.get("/audit-sink")
+async def audit_sink_metrics():
+    sink = get_audit_sink()
+    if sink is None:
+        return {"enabled": False}
+    return sink.stats()
+
+@router.get("/log-batcher")
+async def log_batcher_metrics():
+    return log_batcher.stats()
+
+
+@router.get("/replicas")
+async def replica_metrics():
+    return replica_router.stats()
+
+
+@router.get("/admission")
+async def admission_metrics():
+    return admission.stats()
+
+
+@router.get("/audit-archive")
+async def audit_archive_metrics():
+    return audit_archiver.stats()
@@ -0,0 +1,32 @@
+import math
+from typing import Any, Dict, Sequence, Tuple
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+
+def normalize_pagination(page: int, page_size: int) -> Tuple[int, int, int]:
+    """Clamp page parameters and return (page, page_size, offset)"""
+    if page < 1:
+        page = 1
+    if page_size < 1:
+        page_size = DEFAULT_PAGE_SIZE
+    if page_size > MAX_PAGE_SIZE:
+        page_size = MAX_PAGE_SIZE
+
+    return page, page_size, (page - 1) * page_size
+
+
+def build_page(items: Sequence[Any], total_count: int, page: int, page_size: int) -> Dict[str, Any]:
+    """Build the body of a PaginatedResponse"""
+    total_pages = math.ceil(total_count / page_size) if total_count > 0 else 0
+
+    return {
+        "items": items,
+        "total_count": total_count,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+        "has_next": page < total_pages,
+        "has_previous": page > 1
+    }
@@ -0,0 +1,95 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from typing import Optional
+from app.db.base import AsyncSessionLocal
+from app.db.replicas import get_read_db
+from app.api import schemas
+from app.core.config import settings
+from app.services.report_refresher import report_refresher, SUMMARY_VIEW
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+FRESHNESS_SQL = text("""
+    SELECT refreshed_at, EXTRACT(EPOCH FROM now() - refreshed_at) AS staleness_seconds
+    FROM report_refreshes
+    WHERE view_name = :view
+""")
+
+# Totals per base unit (ml, g, mol, each); chemicals with units outside the
+# registry keep their own unit. Empty and low stock compare the same base
+# quantity, so the threshold is in the group's base unit (5 kg and 5 mg of a
+# "g" group are 5000 and 0.005 against it).
+UNITS_SQL = text(f"""
+    SELECT
+        COALESCE(base_unit, unit) AS unit,
+        COUNT(*) AS chemical_count,
+        COALESCE(SUM(COALESCE(base_quantity, quantity)), 0) AS total_quantity,
+        COUNT(*) FILTER (WHERE COALESCE(base_quantity, quantity) <= 0) AS empty_count,
+        COUNT(*) FILTER (
+            WHERE COALESCE(base_quantity, quantity) > 0 AND COALESCE(base_quantity, quantity) < :low
+        ) AS low_stock_count
+    FROM {SUMMARY_VIEW}
+    GROUP BY 1
+    ORDER BY 1
+""")
+
+TOP_MOVERS_SQL = {
+    window: text(f"""
+        SELECT chemical_id, name, cas_number, unit, quantity, base_unit,
+               movements_{window} AS movements, quantity_moved_{window} AS quantity_moved
+        FROM {SUMMARY_VIEW}
+        WHERE movements_{window} > 0
+        ORDER BY quantity_moved_{window} DESC, chemical_id
+        LIMIT :limit
+    """)
+    for window in ("7d", "30d")
+}
+
+
+async def build_summary(db: AsyncSession, low_stock_threshold: float, top: int) -> dict:
+    freshness = (await db.execute(FRESHNESS_SQL, {"view": SUMMARY_VIEW})).mappings().one_or_none()
+    units = (await db.execute(UNITS_SQL, {"low": low_stock_threshold})).mappings().all()
+    movers = {
+        window: (await db.execute(statement, {"limit": top})).mappings().all()
+        for window, statement in TOP_MOVERS_SQL.items()
+    }
+
+    return {
+        "refreshed_at": freshness["refreshed_at"] if freshness else None,
+        "staleness_seconds": float(freshness["staleness_seconds"]) if freshness else None,
+        "chemical_count": sum(row["chemical_count"] for row in units),
+        "empty_count": sum(row["empty_count"] for row in units),
+        "low_stock_count": sum(row["low_stock_count"] for row in units),
+        "low_stock_threshold": low_stock_threshold,
+        "units": [dict(row) for row in units],
+        "top_movers_7d": [dict(row) for row in movers["7d"]],
+        "top_movers_30d": [dict(row) for row in movers["30d"]],
+    }
+
+
+@router.get("/summary", response_model=schemas.InventorySummary)
+async def inventory_summary(
+    low_stock_threshold: Optional[float] = None,
+    top: int = Query(settings.REPORT_TOP_MOVERS, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Fleet-wide totals from the summary view, as of its last refresh"""
+    if low_stock_threshold is None:
+        low_stock_threshold = settings.REPORT_LOW_STOCK_THRESHOLD
+    return await build_summary(db, low_stock_threshold, top)
+
+
+@router.post("/summary/refresh", response_model=schemas.InventorySummary)
+async def refresh_inventory_summary(
+    low_stock_threshold: Optional[float] = None,
+    top: int = Query(settings.REPORT_TOP_MOVERS, ge=1, le=100)
+):
+    """Rebuild the summary view on the primary, then answer like GET /summary"""
+    if low_stock_threshold is None:
+        low_stock_threshold = settings.REPORT_LOW_STOCK_THRESHOLD
+
+    await report_refresher.refresh(force=True)
+    # Read the refreshed view on the primary, not a replica that may lag
+    async with AsyncSessionLocal() as primary:
+        return await build_summary(primary, low_stock_threshold, top)
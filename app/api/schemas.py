@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from datetime import datetime
 from typing import Optional, List, Generic, TypeVar
 from app.models.inventory_log import ActionType
+from app.core.units import canonical_unit
 
 T = TypeVar('T')
 
@@ -14,7 +15,10 @@ class ChemicalBase(BaseModel):
 
 
 class ChemicalCreate(ChemicalBase):
-    pass
+    @field_validator("unit")
+    @classmethod
+    def validate_unit(cls, value: str) -> str:
+        return canonical_unit(value)
 
 
 class ChemicalUpdate(BaseModel):
@@ -22,10 +26,37 @@ class ChemicalUpdate(BaseModel):
     cas_number: Optional[str] = None
     quantity: Optional[float] = None
     unit: Optional[str] = None
+    
+    @field_validator("unit")
+    @classmethod
+    def validate_unit(cls, value: Optional[str]) -> Optional[str]:
+        return canonical_unit(value) if value is not None else None
+
+
+class ChemicalBulkUpdateItem(ChemicalUpdate):
+    id: int
+
+
+class ChemicalBulkUpdate(BaseModel):
+    items: List[ChemicalBulkUpdateItem]
+
+
+class ChemicalBulkConflict(BaseModel):
+    id: int
+    field: str
+    detail: str
+
+
+class ChemicalLookup(BaseModel):
+    ids: List[int] = []
+    cas_numbers: List[str] = []
 
 
 class Chemical(ChemicalBase):
     id: int
+    version: int
+    base_quantity: Optional[float] = None
+    base_unit: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     
@@ -33,6 +64,18 @@ class Chemical(ChemicalBase):
         from_attributes = True
 
 
+class ChemicalLookupResult(BaseModel):
+    items: List[Chemical]
+    missing_ids: List[int]
+    missing_cas_numbers: List[str]
+
+
+class ChemicalBulkUpdateResult(BaseModel):
+    updated: List[Chemical]
+    not_found: List[int]
+    conflicts: List[ChemicalBulkConflict]
+
+
 class InventoryLogBase(BaseModel):
     action_type: ActionType
     quantity: float
@@ -72,4 +115,51 @@ class AuditLog(BaseModel):
     user_info: Optional[str] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class PurgeJob(BaseModel):
+    id: int
+    chemical_id: int
+    status: str
+    total_rows: Optional[int] = None
+    deleted_rows: int
+    progress: Optional[float] = None  # Percent of total_rows deleted, once counted
+    attempts: int
+    last_error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    completed_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class UnitSummary(BaseModel):
+    unit: str
+    chemical_count: int
+    total_quantity: float
+    empty_count: int
+    low_stock_count: int
+
+
+class TopMover(BaseModel):
+    chemical_id: int
+    name: str
+    cas_number: str
+    unit: str
+    quantity: float
+    base_unit: Optional[str] = None
+    movements: int
+    quantity_moved: float  # In base_unit when the chemical's unit is known
+
+
+class InventorySummary(BaseModel):
+    refreshed_at: Optional[datetime] = None
+    staleness_seconds: Optional[float] = None
+    chemical_count: int
+    empty_count: int
+    low_stock_count: int
+    low_stock_threshold: float
+    units: List[UnitSummary]
+    top_movers_7d: List[TopMover]
+    top_movers_30d: List[TopMover]
\ No newline at end of file
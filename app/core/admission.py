@@ -0,0 +1,252 @@
+"""Admission control: bound the work in flight so a slow database sheds load
+instead of letting every request queue on the connection pool until all of
+them time out together.
+
+Requests are grouped into route classes (reads, writes, exports), each with a
+concurrency limit and a bounded FIFO wait queue. A request that finds its
+class full waits in the queue; it is answered 503 with Retry-After at once
+when the queue is full or the estimated wait (queue position times the
+class's average service time) exceeds the deadline, and after the deadline
+if it is still waiting then. An optional per-client token bucket answers 429.
+"""
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+from app.core.config import settings
+
+# Probes, metrics and diagnostics stay reachable under overload
+EXEMPT_PATHS = ("/health", "/ready", "/api/v1/metrics/", "/api/v1/diagnostics/", "/docs", "/redoc", "/openapi.json")
+EXPORT_PREFIXES = ("/api/v1/reports/",)
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+# POST only to carry a body; they read, like GET (handlers set request.state.read_only)
+READ_ONLY_PATHS = {"/api/v1/chemicals/lookup"}
+
+SERVICE_TIME_SMOOTHING = 0.2
+MAX_TRACKED_CLIENTS = 10_000
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """Route class of a request, None for requests exempt from admission control"""
+    if path == "/" or path.startswith(EXEMPT_PATHS):
+        return None
+    if path.startswith(EXPORT_PREFIXES):
+        return "exports"
+    if method in SAFE_METHODS or path.rstrip("/") in READ_ONLY_PATHS:
+        return "reads"
+    return "writes"
+
+
+class Shed(Exception):
+    def __init__(self, reason: str, retry_after: float):
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RouteClassLimiter:
+    """Concurrency limit with a bounded FIFO queue for one route class"""
+
+    def __init__(self, name: str, limit: int, queue_size: int, deadline: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.deadline = deadline
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.avg_service_time: Optional[float] = None
+        self.admitted = 0
+        self.queued = 0
+        self.shed = {"queue_full": 0, "deadline": 0, "timeout": 0}
+
+    def estimated_wait(self, position: int) -> float:
+        """Seconds until the request at ``position`` (1-based) in the queue gets a slot"""
+        return position / self.limit * (self.avg_service_time or 0.0)
+
+    def _shed(self, reason: str) -> Shed:
+        self.shed[reason] += 1
+        return Shed(reason, max(self.estimated_wait(len(self._waiters) + 1), 1.0))
+
+    async def acquire(self):
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.queue_size:
+            raise self._shed("queue_full")
+        if self.estimated_wait(len(self._waiters) + 1) > self.deadline:
+            raise self._shed("deadline")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            # release() hands its slot over directly, so in_flight is already counted
+            await asyncio.wait_for(asyncio.shield(waiter), self.deadline)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # Granted just as the deadline passed: keep the slot
+                self.admitted += 1
+                return
+            self._waiters.remove(waiter)
+            raise self._shed("timeout")
+        except asyncio.CancelledError:
+            if waiter.done():
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        self.admitted += 1
+
+    def release(self, service_time: Optional[float] = None):
+        if service_time is not None:
+            if self.avg_service_time is None:
+                self.avg_service_time = service_time
+            else:
+                self.avg_service_time += SERVICE_TIME_SMOOTHING * (service_time - self.avg_service_time)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> Dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "queue_size": self.queue_size,
+            "deadline_seconds": self.deadline,
+            "avg_service_ms": round(self.avg_service_time * 1000, 2) if self.avg_service_time is not None else None,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": dict(self.shed),
+        }
+
+
+class RateLimiter:
+    """Per-client token buckets held in memory (per worker process)"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # client -> (tokens, updated)
+        self.limited = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def take(self, client: str) -> Optional[float]:
+        """None when the request may proceed, else seconds until a token is available"""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens < 1:
+            self._buckets[client] = (tokens, now)
+            self.limited += 1
+            return (1 - tokens) / self.rate
+        self._buckets[client] = (tokens - 1, now)
+        if len(self._buckets) > MAX_TRACKED_CLIENTS:
+            self._forget_idle(now)
+        return None
+
+    def _forget_idle(self, now: float):
+        # A bucket that would have refilled completely is the same as no bucket
+        refill = self.burst / self.rate
+        self._buckets = {
+            client: bucket for client, bucket in self._buckets.items() if now - bucket[1] < refill
+        }
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "per_second": self.rate,
+            "burst": self.burst,
+            "tracked_clients": len(self._buckets),
+            "limited": self.limited,
+        }
+
+
+class AdmissionController:
+    def __init__(self, limits: Dict[str, int], queue_size: int, deadline: float, rate: float, burst: int):
+        self.limiters = {
+            name: RouteClassLimiter(name, limit, queue_size, deadline)
+            for name, limit in limits.items() if limit > 0
+        }
+        self.rate_limiter = RateLimiter(rate, burst)
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": settings.ADMISSION_CONTROL_ENABLED,
+            "classes": {name: limiter.stats() for name, limiter in self.limiters.items()},
+            "rate_limit": self.rate_limiter.stats(),
+        }
+
+
+admission = AdmissionController(
+    limits={
+        "reads": settings.ADMISSION_READ_CONCURRENCY,
+        "writes": settings.ADMISSION_WRITE_CONCURRENCY,
+        "exports": settings.ADMISSION_EXPORT_CONCURRENCY,
+    },
+    queue_size=settings.ADMISSION_QUEUE_SIZE,
+    deadline=settings.ADMISSION_QUEUE_DEADLINE_SECONDS,
+    rate=settings.RATE_LIMIT_PER_SECOND,
+    burst=settings.RATE_LIMIT_BURST
+)
+
+
+async def _reject(send, status_code: int, detail: str, reason: str, retry_after: float):
+    body = json.dumps({"detail": detail, "reason": reason}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(math.ceil(retry_after)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware, so a shed request costs no more than a dict lookup and two sends"""
+
+    def __init__(self, app, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        name = route_class(scope["method"], scope["path"])
+        if name is None:
+            return await self.app(scope, receive, send)
+
+        rate_limiter = self.controller.rate_limiter
+        if rate_limiter.enabled:
+            # uvicorn resolves the client from X-Forwarded-For for trusted proxies
+            client = scope["client"][0] if scope.get("client") else "unknown"
+            retry_after = rate_limiter.take(client)
+            if retry_after is not None:
+                return await _reject(send, 429, "Rate limit exceeded", "rate_limited", retry_after)
+
+        limiter = self.controller.limiters.get(name)
+        if limiter is None:
+            return await self.app(scope, receive, send)
+        try:
+            await limiter.acquire()
+        except Shed as shed:
+            return await _reject(
+                send, 503, f"Server is overloaded ({name}); retry later", shed.reason, shed.retry_after
+            )
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - started)
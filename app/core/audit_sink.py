@@ -0,0 +1,272 @@
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.core.logging_config import get_log_dir
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "audit-"
+SEGMENT_SUFFIX = ".ndjson"
+COMPRESSED_SUFFIX = ".ndjson.gz"
+
+_STOP = object()
+
+
+class AuditSegmentWriter:
+    """Append-only NDJSON audit trail written from a background thread.
+
+    Callers only enqueue entries. The writer thread keeps a single open handle
+    for the active segment, group-commits with one fsync per interval, rotates
+    on size or age and gzips closed segments in the background.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        fsync_interval: float = 0.2,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        max_segment_age: float = 3600,
+        queue_size: int = 100000
+    ):
+        self.directory = Path(directory)
+        self.fsync_interval = fsync_interval
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._encode = json.JSONEncoder(separators=(",", ":"), default=str).encode
+        self._thread: Optional[threading.Thread] = None
+        self._compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audit-compress")
+
+        self._file = None
+        self._path: Optional[Path] = None
+        self._segment_bytes = 0
+        self._segment_opened = 0.0
+        self._sequence = 0
+        self._dirty = False
+        self._last_sync = 0.0
+
+        self.written = 0
+        self.dropped = 0
+        self.fsyncs = 0
+        self.segments_closed = 0
+
+    def start(self):
+        self.directory.mkdir(exist_ok=True, parents=True)
+        # Segments left uncompressed by an exited process are closed now
+        for path in sorted(self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")):
+            if not _writer_alive(path):
+                self._compressor.submit(compress_segment, path)
+
+        self._thread = threading.Thread(target=self._run, name="audit-segment-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Write and fsync everything queued, close the segment and finish compression"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+        self._compressor.shutdown(wait=True)
+
+    def submit(self, entry: Dict) -> bool:
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": True,
+            "directory": str(self.directory),
+            "active_segment": self._path.name if self._path else None,
+            "queue_depth": self._queue.qsize(),
+            "written_entries": self.written,
+            "dropped_entries": self.dropped,
+            "fsyncs": self.fsyncs,
+            "segments_closed": self.segments_closed,
+        }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.fsync_interval)
+            except queue.Empty:
+                item = None
+
+            # Drain everything already queued into the same group commit
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                    break
+                self._write(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            now = time.monotonic()
+            if self._dirty and (stopping or now - self._last_sync >= self.fsync_interval):
+                self._sync(now)
+            if self._file is not None and now - self._segment_opened >= self.max_segment_age:
+                self._close_segment()
+
+        self._close_segment()
+
+    def _write(self, entry: Dict):
+        try:
+            if self._file is None:
+                self._open_segment()
+            line = self._encode(entry) + "\n"
+            self._file.write(line)
+            self._segment_bytes += len(line)
+            self._dirty = True
+            self.written += 1
+            if self._segment_bytes >= self.max_segment_bytes:
+                self._close_segment()
+        except Exception as e:
+            logger.error(f"Error writing audit segment: {e}")
+
+    def _open_segment(self):
+        self._sequence += 1
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        owner = f"{os.getpid()}-{_process_start(os.getpid())}"
+        self._path = self.directory / f"{SEGMENT_PREFIX}{stamp}-{owner}-{self._sequence:06d}{SEGMENT_SUFFIX}"
+        self._file = open(self._path, "a", buffering=1024 * 1024, encoding="utf-8")
+        self._segment_bytes = 0
+        self._segment_opened = time.monotonic()
+        self._last_sync = self._segment_opened
+
+    def _sync(self, now: float):
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.fsyncs += 1
+        except Exception as e:
+            logger.error(f"Error syncing audit segment: {e}")
+        self._dirty = False
+        self._last_sync = now
+
+    def _close_segment(self):
+        if self._file is None:
+            return
+        if self._dirty:
+            self._sync(time.monotonic())
+        self._file.close()
+        self._compressor.submit(compress_segment, self._path)
+        self.segments_closed += 1
+        self._file = None
+        self._path = None
+
+
+def compress_segment(path: Path):
+    """gzip a closed segment next to itself and remove the original"""
+    target = path.with_name(path.name + ".gz")
+    tmp = path.with_name(path.name + ".gz.tmp")
+    try:
+        with open(path, "rb") as src, gzip.open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        with open(tmp, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, target)
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"Error compressing audit segment {path.name}: {e}")
+
+
+def _process_start(pid: int) -> int:
+    """Start time of a process in clock ticks since boot, 0 where /proc is unavailable"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Fields after the parenthesised command name; starttime is field 22
+            return int(f.read().rsplit(")", 1)[1].split()[19])
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _writer_alive(path: Path) -> bool:
+    """Whether the process that owns an uncompressed segment is still running.
+
+    Segment names carry the writer's pid and start time: after a container
+    restart the pid is likely reused by another process, but not its start time.
+    """
+    parts = path.name[:-len(SEGMENT_SUFFIX)].split("-")
+    try:
+        pid = int(parts[2])
+        # Segments named before the start time was recorded have four parts
+        started = int(parts[3]) if len(parts) == 5 else 0
+        os.kill(pid, 0)
+    except (ValueError, IndexError, ProcessLookupError):
+        return False
+    except PermissionError:
+        pass
+    if started and _process_start(pid) != started:
+        return False
+    return pid != os.getpid()
+
+
+def list_segments(directory: Path) -> List[Path]:
+    """All segments in write order (compressed or not)"""
+    segments = [
+        p for p in Path(directory).iterdir()
+        if p.name.startswith(SEGMENT_PREFIX) and (p.name.endswith(SEGMENT_SUFFIX) or p.name.endswith(COMPRESSED_SUFFIX))
+    ]
+    return sorted(segments, key=lambda p: p.name)
+
+
+def open_segment(path: Path):
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def get_audit_dir() -> Path:
+    if settings.AUDIT_FILE_DIR:
+        return Path(settings.AUDIT_FILE_DIR)
+    return get_log_dir() / "audit"
+
+
+# Global writer - started and stopped by the application lifespan
+_audit_sink: Optional[AuditSegmentWriter] = None
+
+
+def get_audit_sink() -> Optional[AuditSegmentWriter]:
+    return _audit_sink
+
+
+def start_audit_sink() -> Optional[AuditSegmentWriter]:
+    global _audit_sink
+    if not settings.AUDIT_FILE_ENABLED or _audit_sink is not None:
+        return _audit_sink
+
+    _audit_sink = AuditSegmentWriter(
+        get_audit_dir(),
+        fsync_interval=settings.AUDIT_FSYNC_INTERVAL_MS / 1000,
+        max_segment_bytes=settings.AUDIT_SEGMENT_MAX_BYTES,
+        max_segment_age=settings.AUDIT_SEGMENT_MAX_AGE_SECONDS,
+        queue_size=settings.AUDIT_FILE_QUEUE_SIZE
+    )
+    _audit_sink.start()
+    return _audit_sink
+
+
+def stop_audit_sink():
+    global _audit_sink
+    if _audit_sink is not None:
+        _audit_sink.stop()
+        _audit_sink = None
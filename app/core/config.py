@@ -12,6 +12,99 @@ class Settings(BaseSettings):
     
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "local")
     
+    # Primary connection pool per worker process; DB_POOL_WARM_CONNECTIONS are
+    # opened (and their hot statements prepared) before the worker takes traffic
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_WARM_CONNECTIONS: int = int(os.getenv("DB_POOL_WARM_CONNECTIONS", "0"))
+    SQL_ECHO: bool = os.getenv("SQL_ECHO", "true").lower() == "true"
+    
+    # Logging queue: records beyond LOG_QUEUE_SIZE follow LOG_QUEUE_POLICY
+    # (drop_newest, drop_oldest or block for LOG_QUEUE_BLOCK_TIMEOUT seconds)
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_QUEUE_POLICY: str = os.getenv("LOG_QUEUE_POLICY", "drop_newest")
+    LOG_QUEUE_BLOCK_TIMEOUT: float = float(os.getenv("LOG_QUEUE_BLOCK_TIMEOUT", "0.05"))
+    # Suffix log file names with the worker pid (entrypoint.sh sets this for --workers);
+    # logging's rotating handlers cannot share one file between processes
+    LOG_FILES_PER_WORKER: bool = os.getenv("LOG_FILES_PER_WORKER", "false").lower() == "true"
+    
+    # File audit trail: NDJSON segments under AUDIT_FILE_DIR (default logs/audit)
+    AUDIT_FILE_ENABLED: bool = os.getenv("AUDIT_FILE_ENABLED", "true").lower() == "true"
+    AUDIT_FILE_DIR: str = os.getenv("AUDIT_FILE_DIR", "")
+    AUDIT_FSYNC_INTERVAL_MS: int = int(os.getenv("AUDIT_FSYNC_INTERVAL_MS", "200"))
+    AUDIT_SEGMENT_MAX_BYTES: int = int(os.getenv("AUDIT_SEGMENT_MAX_BYTES", str(64 * 1024 * 1024)))
+    AUDIT_SEGMENT_MAX_AGE_SECONDS: int = int(os.getenv("AUDIT_SEGMENT_MAX_AGE_SECONDS", "3600"))
+    AUDIT_FILE_QUEUE_SIZE: int = int(os.getenv("AUDIT_FILE_QUEUE_SIZE", "100000"))
+    
+    # Idempotency-Key replay window and in-process hot cache size
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    IDEMPOTENCY_CACHE_SIZE: int = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = int(os.getenv("IDEMPOTENCY_PURGE_INTERVAL_SECONDS", "3600"))
+    
+    # Opt-in coalescing of concurrent POST /chemicals/{id}/log writes
+    INVENTORY_LOG_BATCHING: bool = os.getenv("INVENTORY_LOG_BATCHING", "false").lower() == "true"
+    INVENTORY_LOG_BATCH_MAX_SIZE: int = int(os.getenv("INVENTORY_LOG_BATCH_MAX_SIZE", "200"))
+    INVENTORY_LOG_BATCH_MAX_DELAY_MS: float = float(os.getenv("INVENTORY_LOG_BATCH_MAX_DELAY_MS", "5"))
+    
+    # Background purge of deleted chemicals' inventory history
+    PURGE_CHUNK_SIZE: int = int(os.getenv("PURGE_CHUNK_SIZE", "5000"))
+    PURGE_CHUNK_PAUSE_MS: int = int(os.getenv("PURGE_CHUNK_PAUSE_MS", "50"))
+    PURGE_POLL_INTERVAL_SECONDS: int = int(os.getenv("PURGE_POLL_INTERVAL_SECONDS", "30"))
+    
+    # Optional read replicas: comma-separated postgresql:// DSNs. Reads fall back to
+    # the primary when a replica lags more than REPLICA_MAX_LAG_SECONDS
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL_SECONDS", "2"))
+    REPLICA_POOL_SIZE: int = int(os.getenv("REPLICA_POOL_SIZE", "10"))
+    
+    # Inventory summary report: materialized view refresh cadence and report defaults
+    REPORT_REFRESH_INTERVAL_SECONDS: int = int(os.getenv("REPORT_REFRESH_INTERVAL_SECONDS", "300"))
+    REPORT_LOW_STOCK_THRESHOLD: float = float(os.getenv("REPORT_LOW_STOCK_THRESHOLD", "10"))
+    REPORT_TOP_MOVERS: int = int(os.getenv("REPORT_TOP_MOVERS", "10"))
+    
+    # Largest item list accepted by PATCH /chemicals/bulk
+    BULK_UPDATE_MAX_ITEMS: int = int(os.getenv("BULK_UPDATE_MAX_ITEMS", "5000"))
+    # Most ids plus CAS numbers resolved by one GET /chemicals/?ids= or POST /chemicals/lookup
+    LOOKUP_MAX_ITEMS: int = int(os.getenv("LOOKUP_MAX_ITEMS", "1000"))
+    
+    # Admission control: concurrent requests per route class before queueing, the
+    # queue per class, and the longest a request may wait before a 503. By default
+    # the classes split the worker's primary pool (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    # so that admitted requests never wait on it. Off until enabled per deployment
+    ADMISSION_CONTROL_ENABLED: bool = os.getenv("ADMISSION_CONTROL_ENABLED", "false").lower() == "true"
+    ADMISSION_EXPORT_CONCURRENCY: int = int(os.getenv(
+        "ADMISSION_EXPORT_CONCURRENCY", str(max(1, (DB_POOL_SIZE + DB_MAX_OVERFLOW) // 8))
+    ))
+    ADMISSION_WRITE_CONCURRENCY: int = int(os.getenv(
+        "ADMISSION_WRITE_CONCURRENCY", str(max(1, (DB_POOL_SIZE + DB_MAX_OVERFLOW) // 3))
+    ))
+    ADMISSION_READ_CONCURRENCY: int = int(os.getenv(
+        "ADMISSION_READ_CONCURRENCY",
+        str(max(1, DB_POOL_SIZE + DB_MAX_OVERFLOW - ADMISSION_WRITE_CONCURRENCY - ADMISSION_EXPORT_CONCURRENCY))
+    ))
+    ADMISSION_QUEUE_SIZE: int = int(os.getenv("ADMISSION_QUEUE_SIZE", "64"))
+    ADMISSION_QUEUE_DEADLINE_SECONDS: float = float(os.getenv("ADMISSION_QUEUE_DEADLINE_SECONDS", "2"))
+    # Per-client token bucket (requests per second, 0 disables, and burst size)
+    RATE_LIMIT_PER_SECOND: float = float(os.getenv("RATE_LIMIT_PER_SECOND", "0"))
+    RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", "50"))
+    
+    # Admin-only profiling endpoints under /api/v1/diagnostics; nothing is mounted or
+    # started while disabled. Requests must send ADMIN_TOKEN in X-Admin-Token
+    DIAGNOSTICS_ENABLED: bool = os.getenv("DIAGNOSTICS_ENABLED", "false").lower() == "true"
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+    # Event-loop stalls longer than this are recorded with the blocking stack
+    LOOP_LAG_THRESHOLD_MS: float = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
+    
+    # Cold tier: audit_logs rows older than AUDIT_ARCHIVE_AFTER_DAYS move to compressed
+    # files under AUDIT_ARCHIVE_DIR (default logs/archive/audit_logs), in chunks
+    AUDIT_ARCHIVE_ENABLED: bool = os.getenv("AUDIT_ARCHIVE_ENABLED", "false").lower() == "true"
+    AUDIT_ARCHIVE_DIR: str = os.getenv("AUDIT_ARCHIVE_DIR", "")
+    AUDIT_ARCHIVE_AFTER_DAYS: int = int(os.getenv("AUDIT_ARCHIVE_AFTER_DAYS", "365"))
+    AUDIT_ARCHIVE_CHUNK_SIZE: int = int(os.getenv("AUDIT_ARCHIVE_CHUNK_SIZE", "10000"))
+    AUDIT_ARCHIVE_CHUNK_PAUSE_MS: int = int(os.getenv("AUDIT_ARCHIVE_CHUNK_PAUSE_MS", "100"))
+    AUDIT_ARCHIVE_INTERVAL_SECONDS: int = int(os.getenv("AUDIT_ARCHIVE_INTERVAL_SECONDS", "86400"))
+    
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.DATABASE_USER}:{self.DATABASE_PASSWORD}@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}"
@@ -0,0 +1,235 @@
+"""In-process diagnostics for a running worker, served by app.api.diagnostics.
+
+- SamplingProfiler: samples the event-loop thread's stack from a helper
+  thread and aggregates collapsed stacks (flamegraph.pl / speedscope input).
+- LoopLagMonitor: a heartbeat task plus a watchdog thread; when the loop
+  stalls past the threshold the watchdog captures the stack of whatever
+  callback is blocking it.
+- AllocationTracker: tracemalloc-based net allocation per endpoint and the
+  top allocation sites, only while tracing has been started.
+
+None of this runs unless DIAGNOSTICS_ENABLED is set.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_STACK_DEPTH = 128
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame) -> str:
+    """Root-first ``a;b;c`` rendering of a frame's stack"""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def format_stack(frame) -> List[str]:
+    """Innermost-last ``file:line in function`` lines of a frame's stack"""
+    lines = []
+    while frame is not None and len(lines) < MAX_STACK_DEPTH:
+        lines.append(f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    return list(reversed(lines))
+
+
+class SamplingProfiler:
+    """Statistical profiler for one thread; one profile at a time per worker"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    def sample(self, thread_id: int, seconds: float, interval: float) -> Counter:
+        """Block for ``seconds`` sampling ``thread_id`` every ``interval``; run off the loop"""
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running in this worker")
+        try:
+            stacks: Counter = Counter()
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                frame = sys._current_frames().get(thread_id)
+                if frame is not None:
+                    stacks[collapse_stack(frame)] += 1
+                del frame
+                time.sleep(interval)
+            return stacks
+        finally:
+            self._lock.release()
+
+    async def profile(self, seconds: float, interval: float) -> Counter:
+        """Profile the event-loop thread this coroutine runs on"""
+        return await asyncio.to_thread(self.sample, threading.get_ident(), seconds, interval)
+
+
+def render_collapsed(stacks: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class LoopLagMonitor:
+    """Measures event-loop lag and records stalls above ``threshold`` seconds"""
+
+    def __init__(self, threshold: float, history: int = 50):
+        self.threshold = threshold
+        self.interval = max(threshold / 4, 0.005)
+        self.stalls: Deque[Dict] = deque(maxlen=history)
+        self.samples = 0
+        self.stall_count = 0
+        self.max_lag = 0.0
+        self.avg_lag = 0.0
+        self._heartbeat = time.monotonic()
+        self._captured: Optional[Dict] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        self._stop.clear()
+        self._watchdog = threading.Thread(
+            target=self._watch, args=(threading.get_ident(),), name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        try:
+            while True:
+                expected = loop.time() + self.interval
+                self._heartbeat = time.monotonic()
+                await asyncio.sleep(self.interval)
+                self._record(max(loop.time() - expected, 0.0))
+        finally:
+            self._stop.set()
+
+    def _record(self, lag: float):
+        self.samples += 1
+        self.max_lag = max(self.max_lag, lag)
+        self.avg_lag += 0.1 * (lag - self.avg_lag)
+        captured, self._captured = self._captured, None
+        if lag < self.threshold:
+            return
+        self.stall_count += 1
+        stall = captured or {
+            "detected_at": datetime.now(timezone.utc).isoformat(),
+            # Many short callbacks rather than one long one: nothing to capture
+            "stack": None,
+        }
+        stall["lag_ms"] = round(lag * 1000, 1)
+        self.stalls.append(stall)
+        logger.warning(f"Event loop blocked for {stall['lag_ms']}ms")
+
+    def _watch(self, loop_thread_id: int):
+        while not self._stop.wait(self.interval):
+            heartbeat = self._heartbeat
+            if self._captured is None and time.monotonic() - heartbeat > self.interval + self.threshold:
+                frame = sys._current_frames().get(loop_thread_id)
+                if frame is not None:
+                    self._captured = {
+                        "detected_at": datetime.now(timezone.utc).isoformat(),
+                        "stack": format_stack(frame),
+                    }
+                del frame
+
+    def stats(self) -> Dict:
+        return {
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "interval_ms": round(self.interval * 1000, 1),
+            "samples": self.samples,
+            "avg_lag_ms": round(self.avg_lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "stalls": self.stall_count,
+            "recent_stalls": list(self.stalls),
+        }
+
+
+class AllocationTracker:
+    """Net traced allocation per endpoint while tracemalloc is running.
+
+    Deltas of the process-wide traced total are approximate when requests
+    overlap; the top allocation sites from a snapshot are exact.
+    """
+
+    def __init__(self):
+        self.endpoints: Dict[str, Dict] = {}
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int):
+        self.endpoints = {}
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self):
+        tracemalloc.stop()
+
+    def record(self, endpoint: str, allocated: int):
+        stats = self.endpoints.setdefault(endpoint, {"requests": 0, "net_bytes": 0, "max_net_bytes": 0})
+        stats["requests"] += 1
+        stats["net_bytes"] += allocated
+        stats["max_net_bytes"] = max(stats["max_net_bytes"], allocated)
+
+    def report(self, limit: int) -> Dict:
+        if not tracemalloc.is_tracing():
+            return {"tracing": False, "endpoints": self.endpoints, "top_sites": []}
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        return {
+            "tracing": True,
+            "traced_bytes": current,
+            "peak_traced_bytes": peak,
+            "endpoints": {
+                endpoint: {**stats, "avg_net_bytes": stats["net_bytes"] // stats["requests"]}
+                for endpoint, stats in sorted(self.endpoints.items(), key=lambda item: -item[1]["net_bytes"])
+            },
+            "top_sites": [
+                {"site": str(stat.traceback[0]), "size_bytes": stat.size, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:limit]
+            ],
+        }
+
+
+class AllocationMiddleware:
+    """Pure ASGI middleware attributing traced allocation to FastAPI route templates"""
+
+    def __init__(self, app, tracker: Optional[AllocationTracker] = None):
+        self.app = app
+        self.tracker = tracker or allocation_tracker
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracemalloc.is_tracing():
+            return await self.app(scope, receive, send)
+        before = tracemalloc.get_traced_memory()[0]
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if tracemalloc.is_tracing():
+                route = scope.get("route")
+                endpoint = f"{scope['method']} {route.path if route is not None else scope['path']}"
+                self.tracker.record(endpoint, tracemalloc.get_traced_memory()[0] - before)
+
+
+profiler = SamplingProfiler()
+loop_lag_monitor = LoopLagMonitor(threshold=settings.LOOP_LAG_THRESHOLD_MS / 1000)
+allocation_tracker = AllocationTracker()
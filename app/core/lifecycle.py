@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import signal
+import time
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select, func, text
+from sqlalchemy.orm import configure_mappers
+from app.core.config import settings
+from app.db.base import engine
+
+logger = logging.getLogger(__name__)
+
+READINESS_DB_TIMEOUT = 2.0
+
+
+class WorkerState:
+    """Warm-up progress of this worker process, reported by /ready"""
+
+    def __init__(self):
+        self.state = "starting"
+        self.warmup_seconds: Optional[float] = None
+        self.warmed_connections = 0
+        self.warmup_error: Optional[str] = None
+
+    async def readiness(self) -> Tuple[bool, Dict]:
+        body = {
+            "status": self.state,
+            "warmup_seconds": self.warmup_seconds,
+            "warmed_connections": self.warmed_connections,
+            "warmup_error": self.warmup_error,
+        }
+        if self.state != "ready":
+            return False, body
+        try:
+            async with engine.connect() as conn:
+                await asyncio.wait_for(conn.execute(text("SELECT 1")), READINESS_DB_TIMEOUT)
+        except Exception as e:
+            body["status"] = "database_unavailable"
+            body["error"] = str(e)
+            return False, body
+        return True, body
+
+
+worker_state = WorkerState()
+
+
+async def _warm_connection(conn):
+    from app.api.chemicals import (
+        READ_CHEMICAL_SQL, LOOKUP_CHEMICALS_SQL, CHEMICAL_EXISTS_SQL, COUNT_LOGS_SQL, READ_LOGS_SQL
+    )
+    from app.models import Chemical
+
+    # ORM queries fill SQLAlchemy's compiled cache and the dialect's statement cache
+    await conn.execute(select(func.count(Chemical.id)).where(Chemical.deleted_at.is_(None)))
+    await conn.execute(select(Chemical).where(Chemical.id == -1, Chemical.deleted_at.is_(None)))
+
+    # Raw reads go through asyncpg's own per-connection statement cache
+    raw = (await conn.get_raw_connection()).driver_connection
+    await raw.fetchrow(READ_CHEMICAL_SQL, -1)
+    await raw.fetch(LOOKUP_CHEMICALS_SQL, [], [])
+    await raw.fetchrow(CHEMICAL_EXISTS_SQL, -1)
+    await raw.fetchval(COUNT_LOGS_SQL, -1)
+    await raw.fetch(READ_LOGS_SQL, -1, 1, 0)
+    await conn.rollback()
+
+
+async def warm_up():
+    """Prepare this worker before it accepts requests.
+
+    Opens DB_POOL_WARM_CONNECTIONS pooled connections at once and runs the hot
+    queries on each, so the first requests neither connect nor prepare. A
+    database outage only degrades warm-up; /ready keeps reporting it.
+    """
+    started = time.perf_counter()
+    configure_mappers()
+
+    count = min(settings.DB_POOL_WARM_CONNECTIONS, settings.DB_POOL_SIZE)
+    connections = []
+    try:
+        opened = await asyncio.gather(*(engine.connect() for _ in range(count)), return_exceptions=True)
+        connections = [conn for conn in opened if not isinstance(conn, BaseException)]
+        if len(connections) < count:
+            raise next(conn for conn in opened if isinstance(conn, BaseException))
+        await asyncio.gather(*(_warm_connection(conn) for conn in connections))
+        worker_state.warmed_connections = len(connections)
+    except Exception as e:
+        worker_state.warmup_error = str(e)
+        logger.warning(f"Connection pool warm-up failed: {e}")
+    finally:
+        for conn in connections:
+            await conn.close()
+
+    worker_state.warmup_seconds = round(time.perf_counter() - started, 3)
+    worker_state.state = "ready"
+    logger.info(
+        f"Worker warm-up finished in {worker_state.warmup_seconds}s "
+        f"({worker_state.warmed_connections} connections)"
+    )
+
+
+def begin_drain():
+    """Mark the worker as draining so load balancers stop routing to it"""
+    worker_state.state = "draining"
+
+
+def install_drain_handlers():
+    """Flip /ready to draining as soon as SIGTERM/SIGINT arrives.
+
+    Chains to the server's own handlers, which stop accepting connections and
+    let in-flight requests finish before the lifespan shutdown runs.
+    """
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        previous = signal.getsignal(sig)
+        if not callable(previous):
+            continue
+
+        def handler(signum, frame, previous=previous):
+            begin_drain()
+            previous(signum, frame)
+
+        try:
+            signal.signal(sig, handler)
+        except ValueError:
+            # Not the main thread (e.g. an embedded server); /ready flips at shutdown
+            return
@@ -1,96 +1,280 @@
 import logging
 import logging.handlers
 import os
-from datetime import datetime
 import json
+import queue
+import threading
+import time
 from pathlib import Path
+from typing import Dict, List, Optional
+from app.core.config import settings
 
+QUEUE_POLICIES = ("drop_newest", "drop_oldest", "block")
 
-def setup_logging():
-    """Configure file-based logging for the application"""
-    
-    # Create logs directory - handle both Docker and local paths
+# Loggers whose own handlers are replaced so they go through the queue too
+SERVER_LOGGERS = ("uvicorn", "uvicorn.access")
+
+_listener: Optional["DrainingQueueListener"] = None
+_queue_handler: Optional["BoundedQueueHandler"] = None
+
+
+def get_log_dir() -> Path:
+    """Create and return the logs directory - handles both Docker and local paths"""
     if os.path.exists("/app/logs"):
         log_dir = Path("/app/logs")
     else:
         log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True, parents=True)
-    
+    return log_dir
+
+
+def log_file(log_dir: Path, name: str) -> Path:
+    """``log_dir / name``, as ``app.<pid>.log`` when every worker writes its own files"""
+    if not settings.LOG_FILES_PER_WORKER:
+        return log_dir / name
+    stem, dot, suffix = name.rpartition(".")
+    return log_dir / f"{stem}.{os.getpid()}{dot}{suffix}"
+
+
+def setup_logging():
+    """Configure file-based logging for the application.
+
+    Request handlers only enqueue records; console and file sinks (including
+    rotation) run on a background QueueListener thread.
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    log_dir = get_log_dir()
+
     # Create formatters
     json_formatter = JsonFormatter()
     standard_formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
-    
-    # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
-    
-    # Remove default handlers
-    root_logger.handlers = []
-    
+
     # 1. Console Handler
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(standard_formatter)
     console_handler.setLevel(logging.INFO)
-    root_logger.addHandler(console_handler)
-    
+
     # 2. General Application Log File (Rotating)
     app_file_handler = logging.handlers.RotatingFileHandler(
-        log_dir / "app.log",
+        log_file(log_dir, "app.log"),
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5
     )
     app_file_handler.setFormatter(standard_formatter)
     app_file_handler.setLevel(logging.INFO)
-    root_logger.addHandler(app_file_handler)
-    
+
     # 3. Error Log File
     error_file_handler = logging.handlers.RotatingFileHandler(
-        log_dir / "errors.log",
+        log_file(log_dir, "errors.log"),
         maxBytes=10*1024*1024,
         backupCount=5
     )
     error_file_handler.setFormatter(standard_formatter)
     error_file_handler.setLevel(logging.ERROR)
-    root_logger.addHandler(error_file_handler)
-    
+
     # 4. Audit Log File (JSON format, daily rotation)
-    audit_logger = logging.getLogger("audit")
-    audit_logger.setLevel(logging.INFO)
-    audit_logger.propagate = False
-    
     audit_file_handler = logging.handlers.TimedRotatingFileHandler(
-        log_dir / "audit.json",
+        log_file(log_dir, "audit.json"),
         when="midnight",
         interval=1,
         backupCount=30
     )
     audit_file_handler.setFormatter(json_formatter)
-    audit_logger.addHandler(audit_file_handler)
-    
+
     # 5. Chemical Operations Log
-    chemical_logger = logging.getLogger("chemicals")
-    chemical_logger.setLevel(logging.INFO)
-    
     chemical_file_handler = logging.handlers.TimedRotatingFileHandler(
-        log_dir / "chemicals.log",
+        log_file(log_dir, "chemicals.log"),
         when="midnight",
         interval=1,
         backupCount=30
     )
     chemical_file_handler.setFormatter(standard_formatter)
-    chemical_logger.addHandler(chemical_file_handler)
-    
+
+    # Sinks per logger; "chemicals" also reaches the root sinks as before
+    root_sinks = [console_handler, app_file_handler, error_file_handler]
+    router = RoutingHandler(
+        routes={
+            "audit": [audit_file_handler],
+            "chemicals": [chemical_file_handler] + root_sinks,
+        },
+        default=root_sinks
+    )
+
+    _queue_handler = BoundedQueueHandler(
+        queue.Queue(maxsize=settings.LOG_QUEUE_SIZE),
+        policy=settings.LOG_QUEUE_POLICY,
+        block_timeout=settings.LOG_QUEUE_BLOCK_TIMEOUT
+    )
+    _listener = DrainingQueueListener(_queue_handler.queue, router)
+    _listener.start()
+
+    # Configure root logger
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+
+    # Remove default handlers
+    root_logger.handlers = [_queue_handler]
+
+    audit_logger = logging.getLogger("audit")
+    audit_logger.setLevel(logging.INFO)
+    audit_logger.propagate = False
+    audit_logger.handlers = [_queue_handler]
+
+    chemical_logger = logging.getLogger("chemicals")
+    chemical_logger.setLevel(logging.INFO)
+    chemical_logger.propagate = False
+    chemical_logger.handlers = [_queue_handler]
+
+    for name in SERVER_LOGGERS:
+        server_logger = logging.getLogger(name)
+        server_logger.handlers = []
+        server_logger.propagate = True
+
     return root_logger
 
 
+def shutdown_logging():
+    """Stop the listener thread after it has written every queued record"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for sink in _listener.handlers[0].sinks():
+            sink.close()
+        _listener = None
+
+
+def get_logging_stats() -> Dict:
+    if _queue_handler is None:
+        return {"enabled": False}
+
+    return {
+        "enabled": True,
+        "policy": _queue_handler.policy,
+        "queue_depth": _queue_handler.queue.qsize(),
+        "queue_capacity": _queue_handler.queue.maxsize,
+        "max_queue_depth": _queue_handler.max_depth,
+        "enqueued_records": _queue_handler.enqueued,
+        "dropped_records": _queue_handler.dropped,
+    }
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler over a bounded queue that never stalls the caller for long.
+
+    When the queue is full, ``drop_newest`` discards the incoming record,
+    ``drop_oldest`` evicts the oldest queued record, and ``block`` waits up to
+    ``block_timeout`` seconds before dropping.
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = "drop_newest", block_timeout: float = 0.05):
+        super().__init__(log_queue)
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown log queue policy: {policy}")
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.enqueued = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self._lock = threading.Lock()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if not self._enqueue_full(record):
+                with self._lock:
+                    self.dropped += 1
+                return
+
+        depth = self.queue.qsize()
+        with self._lock:
+            self.enqueued += 1
+            if depth > self.max_depth:
+                self.max_depth = depth
+
+    def _enqueue_full(self, record) -> bool:
+        if self.policy == "block":
+            try:
+                self.queue.put(record, timeout=self.block_timeout)
+                return True
+            except queue.Full:
+                return False
+
+        if self.policy == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                with self._lock:
+                    self.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+                return True
+            except queue.Full:
+                return False
+
+        return False
+
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop sentinel waits for room instead of raising on a full queue"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class RoutingHandler(logging.Handler):
+    """Dispatch records from the queue to the sinks of their top-level logger"""
+
+    def __init__(self, routes: Dict[str, List[logging.Handler]], default: List[logging.Handler]):
+        super().__init__()
+        self.routes = routes
+        self.default = default
+
+    def handle(self, record):
+        sinks = self.routes.get(record.name.split(".", 1)[0], self.default)
+        for sink in sinks:
+            if record.levelno >= sink.level:
+                sink.handle(record)
+        return True
+
+    def sinks(self) -> List[logging.Handler]:
+        unique = []
+        for sink in self.default + [h for handlers in self.routes.values() for h in handlers]:
+            if sink not in unique:
+                unique.append(sink)
+        return unique
+
+
 class JsonFormatter(logging.Formatter):
-    """Custom JSON formatter for structured logging"""
-    
+    """Custom JSON formatter for structured logging.
+
+    Uses the record's creation time and caches the formatted second, so a
+    record costs one small dict and one encode call.
+    """
+
+    EXTRA_FIELDS = ("table_name", "operation", "record_id", "old_values", "new_values")
+
+    def __init__(self):
+        super().__init__()
+        self._encode = json.JSONEncoder(separators=(",", ":"), default=str).encode
+        self._cached_second = None
+        self._cached_prefix = ""
+
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._cached_second = second
+        return f"{self._cached_prefix}.{int((created - second) * 1_000_000):06d}"
+
     def format(self, record):
         log_obj = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -98,17 +282,11 @@ class JsonFormatter(logging.Formatter):
             "function": record.funcName,
             "line": record.lineno
         }
-        
+
         # Add extra fields if present
-        if hasattr(record, 'table_name'):
-            log_obj['table_name'] = record.table_name
-        if hasattr(record, 'operation'):
-            log_obj['operation'] = record.operation
-        if hasattr(record, 'record_id'):
-            log_obj['record_id'] = record.record_id
-        if hasattr(record, 'old_values'):
-            log_obj['old_values'] = record.old_values
-        if hasattr(record, 'new_values'):
-            log_obj['new_values'] = record.new_values
-        
-        return json.dumps(log_obj)
\ No newline at end of file
+        extras = record.__dict__
+        for field in self.EXTRA_FIELDS:
+            if field in extras:
+                log_obj[field] = extras[field]
+
+        return self._encode(log_obj)
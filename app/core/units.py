@@ -0,0 +1,83 @@
+"""Unit registry used to store every quantity a second time in a common base unit.
+
+Each accepted unit belongs to a dimension whose base unit is ml (volume),
+g (mass), mol (amount) or each (count). ``base_quantity = quantity * factor``
+is kept next to the original value so totals, thresholds and range filters
+across chemicals are plain SQL over ``base_unit``/``base_quantity``.
+"""
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+class Unit(NamedTuple):
+    symbol: str     # Canonical spelling stored in chemicals.unit
+    base_unit: str
+    factor: float   # Base units in one of this unit
+
+
+UNITS: Dict[str, Unit] = {unit.symbol: unit for unit in (
+    Unit("ul", "ml", 0.001),
+    Unit("ml", "ml", 1.0),
+    Unit("l", "ml", 1000.0),
+    Unit("ug", "g", 0.000001),
+    Unit("mg", "g", 0.001),
+    Unit("g", "g", 1.0),
+    Unit("kg", "g", 1000.0),
+    Unit("umol", "mol", 0.000001),
+    Unit("mmol", "mol", 0.001),
+    Unit("mol", "mol", 1.0),
+    Unit("each", "each", 1.0),
+)}
+
+# Other spellings accepted on input (compared lowercased)
+ALIASES: Dict[str, str] = {
+    "µl": "ul", "μl": "ul", "microliter": "ul", "microlitre": "ul",
+    "milliliter": "ml", "millilitre": "ml", "milliliters": "ml", "millilitres": "ml", "cc": "ml",
+    "liter": "l", "litre": "l", "liters": "l", "litres": "l",
+    "µg": "ug", "μg": "ug", "microgram": "ug", "micrograms": "ug",
+    "milligram": "mg", "milligrams": "mg",
+    "gram": "g", "grams": "g",
+    "kilogram": "kg", "kilograms": "kg",
+    "µmol": "umol", "μmol": "umol",
+    "ea": "each", "pc": "each", "pcs": "each", "piece": "each", "pieces": "each", "unit": "each", "units": "each",
+}
+
+
+def lookup(unit: Optional[str]) -> Optional[Unit]:
+    if unit is None:
+        return None
+    key = unit.strip().lower()
+    return UNITS.get(ALIASES.get(key, key))
+
+
+def canonical_unit(unit: str) -> str:
+    """Canonical symbol for an accepted spelling; ValueError for unknown units"""
+    found = lookup(unit)
+    if found is None:
+        raise ValueError(f"Unknown unit '{unit}'; accepted units: {', '.join(UNITS)}")
+    return found.symbol
+
+
+def to_base(quantity: Optional[float], unit: Optional[str]) -> Tuple[Optional[float], Optional[str]]:
+    """(base_quantity, base_unit), or (None, None) for units outside the registry"""
+    found = lookup(unit)
+    if found is None or quantity is None:
+        return None, None
+    return quantity * found.factor, found.base_unit
+
+
+def _sql_case(unit_expression: str, value) -> str:
+    spellings = {**{symbol: symbol for symbol in UNITS}, **ALIASES}
+    branches = " ".join(
+        f"WHEN '{spelling}' THEN {value(UNITS[symbol])}" for spelling, symbol in spellings.items()
+    )
+    return f"(CASE lower(trim({unit_expression})) {branches} END)"
+
+
+def sql_factor(unit_expression: str) -> str:
+    """SQL expression for the factor of ``unit_expression`` (NULL for unknown units)"""
+    return _sql_case(unit_expression, lambda unit: f"CAST({unit.factor!r} AS double precision)")
+
+
+def sql_base_unit(unit_expression: str) -> str:
+    """SQL expression for the base unit of ``unit_expression`` (NULL for unknown units)"""
+    return _sql_case(unit_expression, lambda unit: f"'{unit.base_unit}'")
@@ -7,8 +7,10 @@ Base = declarative_base()
 
 engine = create_async_engine(
     settings.ASYNC_DATABASE_URL,
-    echo=True,
-    future=True
+    echo=settings.SQL_ECHO,
+    future=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW
 )
 
 AsyncSessionLocal = async_sessionmaker(
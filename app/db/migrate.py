@@ -0,0 +1,176 @@
+"""Bring the database schema to the Alembic head revision.
+
+    python -m app.db.migrate            # upgrade if needed (deploy jobs, entrypoint.sh)
+    python -m app.db.migrate --check    # exit 1 when not at head, 2 when unreachable
+
+The up-to-date case costs one query and imports neither Alembic nor the
+application. Upgrades hold an advisory lock so containers starting together
+migrate once. Databases built by the old ``create_all`` startup step (tables
+but no alembic_version) are stamped at the revision their schema matches and
+upgraded from there.
+"""
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import Optional
+import psycopg2
+from psycopg2 import errors
+from app.core.config import settings
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+VERSIONS_DIR = PROJECT_ROOT / "alembic" / "versions"
+MIGRATION_LOCK_ID = 0x5D5A1E
+
+REVISION_RE = re.compile(r"^revision\s*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+DOWN_REVISION_RE = re.compile(r"^down_revision\s*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+
+
+def head_revision() -> str:
+    """Head of the migration chain, read from the version files without importing them"""
+    revisions, parents = set(), set()
+    for path in VERSIONS_DIR.glob("*.py"):
+        source = path.read_text()
+        revision = REVISION_RE.search(source)
+        if revision:
+            revisions.add(revision.group(1))
+            down_revision = DOWN_REVISION_RE.search(source)
+            if down_revision:
+                parents.add(down_revision.group(1))
+
+    heads = revisions - parents
+    if len(heads) != 1:
+        raise RuntimeError(f"Expected one Alembic head, found {sorted(heads)}")
+    return heads.pop()
+
+
+def current_revision(conn) -> Optional[str]:
+    """Revision stamped in alembic_version, None when the table is missing or empty"""
+    with conn.cursor() as cur:
+        try:
+            cur.execute("SELECT version_num FROM alembic_version")
+        except errors.UndefinedTable:
+            conn.rollback()
+            return None
+        row = cur.fetchone()
+    conn.rollback()
+    return row[0] if row else None
+
+
+def legacy_revision(conn) -> Optional[str]:
+    """Revision matching a schema created by create_all, None for an empty database"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT
+                to_regclass('public.chemicals') IS NOT NULL,
+                to_regclass('public.idempotency_keys') IS NOT NULL,
+                to_regclass('public.purge_jobs') IS NOT NULL,
+                EXISTS (SELECT 1 FROM information_schema.columns
+                        WHERE table_name = 'chemicals' AND column_name = 'deleted_at'),
+                EXISTS (SELECT 1 FROM information_schema.columns
+                        WHERE table_name = 'chemicals' AND column_name = 'version')
+        """)
+        has_chemicals, has_idempotency, has_purge_jobs, has_deleted_at, has_version = cur.fetchone()
+    conn.rollback()
+
+    if not has_chemicals:
+        return None
+    if has_version:
+        return "006"
+    if has_deleted_at and has_purge_jobs:
+        return "005"
+    if has_idempotency:
+        return "004"
+    return "003"
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    return config
+
+
+def connect():
+    return psycopg2.connect(
+        host=settings.DATABASE_HOST,
+        port=settings.DATABASE_PORT,
+        user=settings.DATABASE_USER,
+        password=settings.DATABASE_PASSWORD,
+        dbname=settings.DATABASE_NAME
+    )
+
+
+def migrate() -> str:
+    head = head_revision()
+    conn = connect()
+    try:
+        if current_revision(conn) == head:
+            print(f"Database is at head ({head}); nothing to do")
+            return head
+
+        from alembic import command
+
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+        conn.commit()
+        try:
+            # Another process may have migrated while we waited for the lock
+            current = current_revision(conn)
+            if current == head:
+                print(f"Database is at head ({head}); migrated by another process")
+                return head
+
+            config = alembic_config()
+            if current is None:
+                legacy = legacy_revision(conn)
+                if legacy is not None:
+                    print(f"Untracked schema found; stamping it at revision {legacy}")
+                    with conn.cursor() as cur:
+                        # create_all never built the composite index from 002
+                        cur.execute(
+                            "CREATE INDEX IF NOT EXISTS ix_audit_logs_table_record "
+                            "ON audit_logs (table_name, record_id)"
+                        )
+                    conn.commit()
+                    command.stamp(config, legacy)
+
+            print(f"Upgrading database from {current_revision(conn) or 'empty'} to {head}")
+            command.upgrade(config, "head")
+        finally:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+            conn.commit()
+        return head
+    finally:
+        conn.close()
+
+
+def check() -> int:
+    head = head_revision()
+    try:
+        conn = connect()
+    except psycopg2.OperationalError as e:
+        print(f"Cannot connect to the database: {e}".strip(), file=sys.stderr)
+        return 2
+    try:
+        current = current_revision(conn)
+    finally:
+        conn.close()
+    print(f"Database revision: {current or 'none'}; head: {head}")
+    return 0 if current == head else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upgrade the database to the Alembic head revision")
+    parser.add_argument("--check", action="store_true", help="Only report; exit 1 when not at head")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(check())
+    migrate()
+
+
+if __name__ == "__main__":
+    main()
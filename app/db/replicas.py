@@ -0,0 +1,270 @@
+import asyncio
+import itertools
+import logging
+import time
+from typing import AsyncGenerator, Dict, List, Optional
+from fastapi import Header, Request, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal, engine
+from app.db.session import get_asyncpg_connection
+
+logger = logging.getLogger(__name__)
+
+CONSISTENCY_HEADER = "X-Consistency-Token"
+READ_SOURCE_HEADER = "X-Read-Source"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Replay lag is zero while a WAL receiver is streaming and the replica has applied
+# everything it received; otherwise it is the age of the last replayed transaction.
+# A replica whose receiver has disconnected has also replayed all it received, so
+# "caught up" alone would keep it healthy while it falls arbitrarily far behind.
+# The view has a row only while a receiver runs, whatever the role's privileges
+STATUS_SQL = text("""
+    SELECT
+        pg_is_in_recovery() AS in_recovery,
+        pg_last_wal_replay_lsn()::text AS replay_lsn,
+        receiver.receiving,
+        CASE
+            WHEN receiver.receiving AND pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END AS lag_seconds
+    FROM (SELECT EXISTS (SELECT 1 FROM pg_stat_wal_receiver) AS receiving) AS receiver
+""")
+
+
+def parse_lsn(value: Optional[str]) -> Optional[int]:
+    """Convert a pg_lsn such as '16/B374D848' to an integer, None if malformed"""
+    if not value:
+        return None
+    try:
+        high, low = value.strip().split("/")
+        return (int(high, 16) << 32) + int(low, 16)
+    except ValueError:
+        return None
+
+
+def to_async_url(url: str) -> str:
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    return url
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine: AsyncEngine = create_async_engine(
+            to_async_url(url),
+            pool_size=settings.REPLICA_POOL_SIZE,
+            pool_pre_ping=True
+        )
+        self.session_factory = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.replay_lsn: Optional[int] = None
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+        self.reads = 0
+
+    @property
+    def name(self) -> str:
+        # Never expose credentials in metrics or logs
+        return self.url.rsplit("@", 1)[-1]
+
+    async def check(self, max_lag: float):
+        try:
+            async with self.engine.connect() as conn:
+                row = (await conn.execute(STATUS_SQL)).mappings().one()
+            self.replay_lsn = parse_lsn(row["replay_lsn"])
+            # NULL: nothing replayed since startup and no receiver to vouch for it
+            self.lag_seconds = float(row["lag_seconds"]) if row["lag_seconds"] is not None else None
+            self.healthy = (
+                bool(row["in_recovery"]) and row["receiving"]
+                and self.lag_seconds is not None and self.lag_seconds <= max_lag
+            )
+            if not row["in_recovery"]:
+                self.last_error = "not in recovery (promoted?)"
+            elif not row["receiving"]:
+                self.last_error = "WAL receiver not running"
+            else:
+                self.last_error = None
+        except Exception as e:
+            if self.healthy:
+                logger.warning(f"Replica {self.name} failed its health check: {e}")
+            self.healthy = False
+            self.last_error = str(e)
+        self.checked_at = time.time()
+
+    async def caught_up_to(self, conn, lsn: str) -> bool:
+        return bool(await conn.fetchval("SELECT pg_last_wal_replay_lsn() >= $1::pg_lsn", lsn))
+
+    def stats(self) -> Dict:
+        return {
+            "replica": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "last_error": self.last_error,
+            "checked_at": self.checked_at,
+            "reads": self.reads,
+        }
+
+
+class ReplicaRouter:
+    """Round-robin read routing over healthy replicas with primary fallback.
+
+    A background loop refreshes each replica's health and replay lag; a
+    replica lagging more than ``max_lag`` seconds is skipped until it catches
+    up. Requests carrying a consistency token (the primary WAL position after
+    a write) only use a replica that has replayed up to that position.
+    """
+
+    def __init__(self, urls: List[str], max_lag: float, check_interval: float):
+        self.replicas = [Replica(url) for url in urls]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+        self.primary_reads = 0
+        self.fallbacks: Dict[str, int] = {"unhealthy": 0, "behind_token": 0, "error": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    async def run_health_checks(self):
+        while True:
+            await asyncio.gather(*(replica.check(self.max_lag) for replica in self.replicas))
+            await asyncio.sleep(self.check_interval)
+
+    async def dispose(self):
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def choose(self, token: Optional[str]) -> Optional[Replica]:
+        """Next healthy replica not known to be behind the token, or None for the primary"""
+        if not self.enabled:
+            return None
+        min_lsn = parse_lsn(token)
+        behind = False
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if not replica.healthy:
+                continue
+            if min_lsn is not None and replica.replay_lsn is not None and replica.replay_lsn < min_lsn:
+                # The cached position may be stale; only skip if it is confirmed below
+                behind = True
+                continue
+            return replica
+        self.fallbacks["behind_token" if behind else "unhealthy"] += 1
+        return None
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "max_lag_seconds": self.max_lag,
+            "primary_reads": self.primary_reads,
+            "fallbacks": dict(self.fallbacks),
+            "replicas": [replica.stats() for replica in self.replicas],
+        }
+
+
+async def current_primary_lsn() -> str:
+    async with engine.connect() as conn:
+        return await conn.scalar(text("SELECT pg_current_wal_lsn()::text"))
+
+
+async def add_consistency_token(request: Request, call_next):
+    """Middleware: give successful writes the primary WAL position to send back on reads"""
+    response = await call_next(request)
+    # Handlers that only read despite an unsafe method set request.state.read_only
+    if (request.method not in SAFE_METHODS and response.status_code < 400
+            and not getattr(request.state, "read_only", False)):
+        try:
+            response.headers[CONSISTENCY_HEADER] = await current_primary_lsn()
+        except Exception as e:
+            logger.warning(f"Could not read primary WAL position: {e}")
+    return response
+
+
+async def _replica_usable(replica: Replica, raw_conn, consistency_token: Optional[str]) -> bool:
+    if parse_lsn(consistency_token) is None or await replica.caught_up_to(raw_conn, consistency_token):
+        replica.reads += 1
+        return True
+    replica_router.fallbacks["behind_token"] += 1
+    return False
+
+
+def _replica_failed(replica: Replica, error: Exception):
+    logger.warning(f"Replica {replica.name} unavailable, reading from primary: {error}")
+    replica.healthy = False
+    replica_router.fallbacks["error"] += 1
+
+
+async def get_read_db(
+    response: Response,
+    consistency_token: Optional[str] = Header(None, alias=CONSISTENCY_HEADER)
+) -> AsyncGenerator[AsyncSession, None]:
+    """get_db for read-only handlers: a replica session when one is usable"""
+    replica = replica_router.choose(consistency_token)
+    if replica is not None:
+        session = replica.session_factory()
+        usable = False
+        try:
+            conn = await session.connection()
+            raw = (await conn.get_raw_connection()).driver_connection
+            usable = await _replica_usable(replica, raw, consistency_token)
+        except Exception as e:
+            _replica_failed(replica, e)
+        if usable:
+            response.headers[READ_SOURCE_HEADER] = "replica"
+            try:
+                yield session
+            finally:
+                await session.close()
+            return
+        await session.close()
+
+    if replica_router.enabled:
+        replica_router.primary_reads += 1
+        response.headers[READ_SOURCE_HEADER] = "primary"
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def get_read_asyncpg_connection(
+    response: Response,
+    consistency_token: Optional[str] = Header(None, alias=CONSISTENCY_HEADER)
+):
+    """get_asyncpg_connection for read-only handlers: a pooled replica connection when one is usable"""
+    replica = replica_router.choose(consistency_token)
+    if replica is not None:
+        conn = None
+        usable = False
+        try:
+            conn = await replica.engine.connect()
+            raw = (await conn.get_raw_connection()).driver_connection
+            usable = await _replica_usable(replica, raw, consistency_token)
+        except Exception as e:
+            _replica_failed(replica, e)
+        if usable:
+            response.headers[READ_SOURCE_HEADER] = "replica"
+            try:
+                yield raw
+            finally:
+                await conn.close()
+            return
+        if conn is not None:
+            await conn.close()
+
+    if replica_router.enabled:
+        replica_router.primary_reads += 1
+        response.headers[READ_SOURCE_HEADER] = "primary"
+    async for conn in get_asyncpg_connection():
+        yield conn
+
+
+replica_router = ReplicaRouter(
+    urls=[url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()],
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS
+)
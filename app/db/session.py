@@ -1,8 +1,6 @@
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.base import AsyncSessionLocal
-import asyncpg
-from app.core.config import settings
+from app.db.base import AsyncSessionLocal, engine
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -11,14 +9,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 
 async def get_asyncpg_connection():
-    conn = await asyncpg.connect(
-        host=settings.DATABASE_HOST,
-        port=settings.DATABASE_PORT,
-        user=settings.DATABASE_USER,
-        password=settings.DATABASE_PASSWORD,
-        database=settings.DATABASE_NAME
-    )
-    try:
-        yield conn
-    finally:
-        await conn.close()
\ No newline at end of file
+    """Raw asyncpg connection borrowed from the engine's pool"""
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        yield raw.driver_connection
@@ -1,20 +1,55 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
-from app.api import chemicals, audit
+from app.api import chemicals, audit, jobs, metrics, reports, diagnostics
 from app.db.base import engine
-from app.core.logging_config import setup_logging
+from app.db.replicas import replica_router, add_consistency_token
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core.audit_sink import start_audit_sink, stop_audit_sink
+from app.core.config import settings
+from app.core.admission import AdmissionMiddleware
+from app.core.diagnostics import AllocationMiddleware, loop_lag_monitor
+from app.core.lifecycle import worker_state, warm_up, begin_drain, install_drain_handlers
+from app.services.idempotency import idempotency
+from app.services.log_batcher import log_batcher
+from app.services.purge_worker import purge_worker
+from app.services.audit_archive import audit_archiver
+from app.services.report_refresher import report_refresher
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Initialize logging on startup
     setup_logging()
+    start_audit_sink()
     logger = logging.getLogger(__name__)
     logger.info("Application started - SDS Chemical Inventory System v1.1.0")
+    await warm_up()
+    install_drain_handlers()
+    background_tasks = [
+        asyncio.create_task(idempotency.run_purge_loop(settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS)),
+        asyncio.create_task(purge_worker.run()),
+        asyncio.create_task(report_refresher.run())
+    ]
+    if replica_router.enabled:
+        background_tasks.append(asyncio.create_task(replica_router.run_health_checks()))
+    if settings.DIAGNOSTICS_ENABLED:
+        background_tasks.append(asyncio.create_task(loop_lag_monitor.run()))
+    if settings.AUDIT_ARCHIVE_ENABLED:
+        background_tasks.append(asyncio.create_task(audit_archiver.run()))
     yield
     logger.info("Application shutting down")
+    begin_drain()
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await log_batcher.stop()
     await engine.dispose()
+    await replica_router.dispose()
+    stop_audit_sink()
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -24,8 +59,21 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+if replica_router.enabled:
+    app.middleware("http")(add_consistency_token)
+if settings.DIAGNOSTICS_ENABLED:
+    app.add_middleware(AllocationMiddleware)
+# Added last so it is outermost: shed requests never reach the other middleware
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+
 app.include_router(chemicals.router, prefix="/api/v1")
 app.include_router(audit.router, prefix="/api/v1")
+app.include_router(jobs.router, prefix="/api/v1")
+app.include_router(reports.router, prefix="/api/v1")
+app.include_router(metrics.router, prefix="/api/v1")
+if settings.DIAGNOSTICS_ENABLED:
+    app.include_router(diagnostics.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -39,4 +87,11 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Ready once this worker has warmed up and can reach the database"""
+    ready, body = await worker_state.readiness()
+    return JSONResponse(status_code=200 if ready else 503, content=body)
\ No newline at end of file
@@ -1,5 +1,8 @@
 from .chemical import Chemical
 from .inventory_log import InventoryLog, ActionType
 from .audit_log import AuditLog
+from .idempotency_key import IdempotencyKey
+from .purge_job import PurgeJob
+from .report_refresh import ReportRefresh
 
-__all__ = ["Chemical", "InventoryLog", "ActionType", "AuditLog"]
\ No newline at end of file
+__all__ = ["Chemical", "InventoryLog", "ActionType", "AuditLog", "IdempotencyKey", "PurgeJob", "ReportRefresh"]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -6,11 +6,18 @@ from app.db.base import Base
 class AuditLog(Base):
     __tablename__ = "audit_logs"
     
-    id = Column(Integer, primary_key=True, index=True)
-    table_name = Column(String, nullable=False, index=True)
-    operation = Column(String, nullable=False, index=True)  # CREATE, UPDATE, DELETE
-    record_id = Column(Integer, nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String, nullable=False)
+    operation = Column(String, nullable=False)  # CREATE, UPDATE, DELETE
+    record_id = Column(Integer, nullable=False)
     old_values = Column(Text, nullable=True)  # JSON string of old values
     new_values = Column(Text, nullable=True)  # JSON string of new values
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
-    user_info = Column(String, nullable=True)  # Can track user/session info later
\ No newline at end of file
+    user_info = Column(String, nullable=True)  # Can track user/session info later
+    
+    # Each matches a GET /audit/logs filter followed by ORDER BY timestamp DESC
+    __table_args__ = (
+        Index("ix_audit_logs_table_operation_timestamp", table_name, operation, timestamp.desc()),
+        Index("ix_audit_logs_record_timestamp", record_id, timestamp.desc()),
+        Index("ix_audit_logs_timestamp", timestamp.desc()),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index, text
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -6,10 +6,21 @@ from app.db.base import Base
 class Chemical(Base):
     __tablename__ = "chemicals"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
-    cas_number = Column(String, unique=True, nullable=False)
+    cas_number = Column(String, nullable=False)
     quantity = Column(Float, nullable=False)
     unit = Column(String, nullable=False)
+    base_quantity = Column(Float, nullable=True)  # quantity in base_unit (see app.core.units); NULL for unknown units
+    base_unit = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
+    version = Column(Integer, nullable=False, server_default="1")  # Bumped by every update; exposed as the ETag
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # Tombstone; row is purged in the background
+    
+    __table_args__ = (
+        # CAS numbers only need to be unique among chemicals that are not deleted
+        Index("uq_chemicals_cas_number_live", "cas_number", unique=True, postgresql_where=text("deleted_at IS NULL")),
+        # Cross-unit totals and quantity range filters over live chemicals
+        Index("ix_chemicals_base_unit_quantity", "base_unit", "base_quantity", postgresql_where=text("deleted_at IS NULL")),
+    )
\ No newline at end of file
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    
+    key = Column(String(255), primary_key=True)
+    scope = Column(String, primary_key=True)  # Route the key was used on, e.g. "POST /chemicals/"
+    request_hash = Column(String(64), nullable=False)  # SHA-256 of the request payload
+    # Both NULL while the claiming transaction is still running the request
+    status_code = Column(Integer)
+    response_body = Column(Text)  # JSON string of the stored response
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -14,8 +14,16 @@ class ActionType(str, enum.Enum):
 class InventoryLog(Base):
     __tablename__ = "inventory_logs"
     
-    id = Column(Integer, primary_key=True, index=True)
-    chemical_id = Column(Integer, ForeignKey("chemicals.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    chemical_id = Column(Integer, ForeignKey("chemicals.id"), nullable=False)
     action_type = Column(Enum(ActionType), nullable=False)
     quantity = Column(Float, nullable=False)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    base_quantity = Column(Float, nullable=True)  # quantity in the chemical's base unit at write time
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        # Append-ordered timestamps: BRIN serves time windows for a few pages of index
+        Index("ix_inventory_logs_timestamp_brin", "timestamp", postgresql_using="brin"),
+        # A chemical's history newest first, as GET /chemicals/{id}/logs pages it
+        Index("ix_inventory_logs_chemical_timestamp", chemical_id, timestamp.desc()),
+    )
\ No newline at end of file
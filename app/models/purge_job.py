@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class PurgeJob(Base):
+    __tablename__ = "purge_jobs"
+    
+    id = Column(Integer, primary_key=True)
+    chemical_id = Column(Integer, nullable=False, index=True)  # No FK: the chemical is removed by the job
+    status = Column(String, nullable=False, server_default="pending", index=True)  # pending, running, completed, failed
+    total_rows = Column(Integer, nullable=True)  # inventory_logs rows counted when the job starts
+    deleted_rows = Column(Integer, nullable=False, server_default="0")
+    attempts = Column(Integer, nullable=False, server_default="0")
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
\ No newline at end of file
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, Float, DateTime
+from app.db.base import Base
+
+
+class ReportRefresh(Base):
+    __tablename__ = "report_refreshes"
+    
+    view_name = Column(String, primary_key=True)  # Materialized view behind a report
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)  # Start of the refreshing transaction
+    duration_ms = Column(Float, nullable=True)
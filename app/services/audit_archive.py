@@ -0,0 +1,442 @@
+"""Cold-tier archive for audit_logs rows older than AUDIT_ARCHIVE_AFTER_DAYS.
+
+    python -m app.services.audit_archive        # archive everything due, then exit
+
+Rows move in chunks, oldest first. Each chunk is written per UTC month to a
+gzip-compressed columnar file (one JSON array per column, rows sorted by
+record_id then timestamp) under ``<archive dir>/<YYYY>/<MM>/`` and fsynced.
+Its row count and id and timestamp ranges go into ``index.json``. For every
+record in it, the file and its row count go into the record's posting list
+in ``records/<bucket>.json`` (RECORD_BUCKET_SIZE records per bucket). The
+chunk's DELETE commits right after. File names derive from the chunk's ids,
+so a retried chunk replaces its own file, or supersedes the file of a first
+attempt whose ids it all contains. Rows whose DELETE failed to commit stay in
+the table as well until the next run re-archives them; readers prefer the
+table's copy.
+
+A record's archived row count comes from its bucket file alone. Row reads
+open only the files in its posting list, newest first, and skip whole files
+that lie before the requested offset.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Collection, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.logging_config import get_log_dir
+from app.db.base import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("id", "table_name", "operation", "record_id", "old_values", "new_values", "timestamp", "user_info")
+INDEX_FILE = "index.json"
+RECORDS_DIR = "records"
+FILE_SUFFIX = ".cols.json.gz"
+RECORD_BUCKET_SIZE = 1000
+CACHED_FILES = 16
+CACHED_BUCKETS = 256
+
+# Namespace for the pg advisory lock that keeps archiving to one process
+ADVISORY_LOCK_NAMESPACE = 0x5D7
+ARCHIVE_LOCK_KEY = 1
+
+SELECT_CHUNK_SQL = text(f"""
+    SELECT {", ".join(COLUMNS)}
+    FROM audit_logs
+    WHERE timestamp < now() - make_interval(days => :days)
+    ORDER BY timestamp, id
+    LIMIT :limit
+""")
+
+
+def get_archive_dir() -> Path:
+    if settings.AUDIT_ARCHIVE_DIR:
+        return Path(settings.AUDIT_ARCHIVE_DIR)
+    # The logs directory is the volume that outlives the container
+    return get_log_dir() / "archive" / "audit_logs"
+
+
+def _write_durably(path: Path, data: bytes):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+class AuditArchive:
+    """Archive files, their index and per-record postings; one writer (advisory lock), many readers"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._index: Optional[List[Dict]] = None
+        self._entries: Dict[str, Dict] = {}
+        self._index_mtime: Optional[float] = None
+        self._buckets: "OrderedDict[int, Tuple[float, Dict[str, Dict[str, int]]]]" = OrderedDict()
+        self._files: "OrderedDict[str, Dict[str, list]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Index and postings
+
+    def index(self) -> List[Dict]:
+        """File entries, reloaded when another process has rewritten index.json"""
+        path = self.directory / INDEX_FILE
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return []
+        with self._lock:
+            if self._index is None or mtime != self._index_mtime:
+                with open(path) as f:
+                    self._index = json.load(f)["files"]
+                self._entries = {entry["path"]: entry for entry in self._index}
+                self._index_mtime = mtime
+            return self._index
+
+    def _entry(self, path: str) -> Optional[Dict]:
+        self.index()
+        return self._entries.get(path)
+
+    def _bucket_path(self, bucket: int) -> Path:
+        return self.directory / RECORDS_DIR / f"{bucket:08d}.json"
+
+    def _postings(self, bucket: int) -> Dict[str, Dict[str, int]]:
+        """record_id (as str) -> {file path: rows of that record in the file} for one bucket"""
+        path = self._bucket_path(bucket)
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return {}
+        with self._lock:
+            cached = self._buckets.get(bucket)
+            if cached is not None and cached[0] == mtime:
+                self._buckets.move_to_end(bucket)
+                return cached[1]
+        with open(path) as f:
+            records = json.load(f)["records"]
+        with self._lock:
+            self._buckets[bucket] = (mtime, records)
+            while len(self._buckets) > CACHED_BUCKETS:
+                self._buckets.popitem(last=False)
+        return records
+
+    def record_files(self, record_id: int) -> Dict[str, int]:
+        return self._postings(record_id // RECORD_BUCKET_SIZE).get(str(record_id), {})
+
+    def count_for_record(self, record_id: int) -> int:
+        return sum(self.record_files(record_id).values())
+
+    # Writing
+
+    def write_chunk(self, rows: List[Dict]) -> List[Dict]:
+        """Write rows (one chunk, any months) to archive files; returns the new index entries"""
+        by_month: Dict[str, List[Dict]] = {}
+        for row in rows:
+            by_month.setdefault(row["timestamp"].astimezone(timezone.utc).strftime("%Y/%m"), []).append(row)
+
+        files = {entry["path"]: entry for entry in self.index()}
+        # bucket -> record_id -> file path -> rows, None to drop the path
+        changes: Dict[int, Dict[str, Dict[str, Optional[int]]]] = {}
+
+        def post(record_id: int, path: str, count: Optional[int]):
+            records = changes.setdefault(record_id // RECORD_BUCKET_SIZE, {})
+            records.setdefault(str(record_id), {})[path] = count
+
+        entries = []
+        for month, month_rows in sorted(by_month.items()):
+            month_rows.sort(key=lambda row: (row["record_id"], row["timestamp"], row["id"]))
+            ids = [row["id"] for row in month_rows]
+            id_set = set(ids)
+            # Concurrent writers interleave ids with timestamps, so the id range alone
+            # does not identify a chunk; the digest does, and a retry reproduces it
+            digest = hashlib.sha1(",".join(map(str, sorted(ids))).encode()).hexdigest()[:8]
+            relative = (
+                f"{month}/audit-{month.replace('/', '-')}-{min(ids):010d}-{max(ids):010d}-{digest}{FILE_SUFFIX}"
+            )
+            columns = {
+                column: [
+                    row[column].isoformat() if column == "timestamp" else row[column] for row in month_rows
+                ]
+                for column in COLUMNS
+            }
+            path = self.directory / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write_durably(path, gzip.compress(json.dumps({"columns": columns}).encode(), compresslevel=6))
+
+            # A retried final chunk selects a superset of its first attempt's rows. Only
+            # a file whose every id is in this chunk is replaced: overlapping id ranges
+            # alone are normal for chunks committed one after another
+            superseded = [
+                entry for entry in files.values()
+                if entry["path"] != relative and entry["path"].startswith(month + "/")
+                and min(ids) <= entry["min_id"] and entry["max_id"] <= max(ids)
+                and id_set.issuperset(self._columns(entry)["id"])
+            ]
+            for entry in superseded:
+                for record_id in set(self._columns(entry)["record_id"]):
+                    post(record_id, entry["path"], None)
+                del files[entry["path"]]
+
+            for record_id in set(columns["record_id"]):
+                start = bisect_left(columns["record_id"], record_id)
+                post(record_id, relative, bisect_right(columns["record_id"], record_id) - start)
+
+            timestamps = columns["timestamp"]
+            entry = {
+                "path": relative,
+                "rows": len(month_rows),
+                "min_id": min(ids),
+                "max_id": max(ids),
+                "min_timestamp": min(timestamps),
+                "max_timestamp": max(timestamps),
+                "bytes": path.stat().st_size,
+            }
+            files[relative] = entry
+            entries.append(entry)
+
+            for old in superseded:
+                (self.directory / old["path"]).unlink(missing_ok=True)
+
+        (self.directory / RECORDS_DIR).mkdir(parents=True, exist_ok=True)
+        for bucket, bucket_changes in changes.items():
+            records = {record: dict(paths) for record, paths in self._postings(bucket).items()}
+            for record, paths in bucket_changes.items():
+                merged = records.setdefault(record, {})
+                for path, count in paths.items():
+                    if count is None:
+                        merged.pop(path, None)
+                    else:
+                        merged[path] = count
+                if not merged:
+                    del records[record]
+            _write_durably(self._bucket_path(bucket), json.dumps({"records": records}, sort_keys=True).encode())
+
+        self._save_index(sorted(files.values(), key=lambda entry: (entry["min_timestamp"], entry["path"])))
+        return entries
+
+    def _save_index(self, files: List[Dict]):
+        data = json.dumps({"version": 2, "files": files}, indent=1, sort_keys=True).encode()
+        _write_durably(self.directory / INDEX_FILE, data)
+
+    # Reading
+
+    def _columns(self, entry: Dict) -> Dict[str, list]:
+        key = f"{entry['path']}:{entry['bytes']}"
+        with self._lock:
+            if key in self._files:
+                self._files.move_to_end(key)
+                return self._files[key]
+        with gzip.open(self.directory / entry["path"], "rt") as f:
+            columns = json.load(f)["columns"]
+        with self._lock:
+            self._files[key] = columns
+            while len(self._files) > CACHED_FILES:
+                self._files.popitem(last=False)
+        return columns
+
+    @staticmethod
+    def _row(columns: Dict[str, list], position: int) -> Dict:
+        row = {column: columns[column][position] for column in COLUMNS}
+        row["timestamp"] = datetime.fromisoformat(row["timestamp"])
+        return row
+
+    def rows_for_record(
+        self, record_id: int, offset: int, limit: int, exclude: Collection[int] = ()
+    ) -> List[Dict]:
+        """Archived rows of one record, newest first, opening only the files the page needs"""
+        files = self.record_files(record_id)
+        entries = [entry for entry in map(self._entry, files) if entry is not None]
+        # Chunks are cut in timestamp order, so files never interleave in time
+        entries.sort(key=lambda entry: (entry["max_timestamp"], entry["max_id"]), reverse=True)
+
+        rows: List[Dict] = []
+        for entry in entries:
+            # Counts include excluded rows, so whole files can only be skipped without them
+            if not exclude and offset >= files[entry["path"]]:
+                offset -= files[entry["path"]]
+                continue
+            columns = self._columns(entry)
+            # Rows are sorted by record_id, then timestamp, within a file
+            start = bisect_left(columns["record_id"], record_id)
+            end = bisect_right(columns["record_id"], record_id)
+            for position in range(end - 1, start - 1, -1):
+                if columns["id"][position] in exclude:
+                    continue
+                if offset:
+                    offset -= 1
+                    continue
+                rows.append(self._row(columns, position))
+                if len(rows) >= limit:
+                    return rows
+        return rows
+
+    def ids_for_record(self, record_id: int) -> Set[int]:
+        ids = set()
+        for entry in map(self._entry, self.record_files(record_id)):
+            if entry is not None:
+                columns = self._columns(entry)
+                start = bisect_left(columns["record_id"], record_id)
+                ids.update(columns["id"][start:bisect_right(columns["record_id"], record_id)])
+        return ids
+
+    def newest_timestamp(self) -> Optional[datetime]:
+        files = self.index()
+        if not files:
+            return None
+        return datetime.fromisoformat(max(entry["max_timestamp"] for entry in files))
+
+    def rows_by_id(self, ids: Iterable[int]) -> Dict[int, Dict]:
+        wanted = set(ids)
+        found = {}
+        if not wanted:
+            return found
+        low, high = min(wanted), max(wanted)
+        for entry in self.index():
+            if entry["max_id"] < low or entry["min_id"] > high:
+                continue
+            columns = self._columns(entry)
+            for position, audit_id in enumerate(columns["id"]):
+                if audit_id in wanted:
+                    found[audit_id] = self._row(columns, position)
+        return found
+
+    def stats(self) -> Dict:
+        files = self.index()
+        return {
+            "directory": str(self.directory),
+            "files": len(files),
+            "rows": sum(entry["rows"] for entry in files),
+            "bytes": sum(entry["bytes"] for entry in files),
+            "oldest": files[0]["min_timestamp"] if files else None,
+            "newest": max(entry["max_timestamp"] for entry in files) if files else None,
+        }
+
+
+class AuditArchiver:
+    """Moves audit_logs rows older than ``after_days`` into the archive in chunks.
+
+    Every worker runs the loop; a session-level advisory lock lets one of
+    them archive at a time. Each chunk's DELETE commits only after its files,
+    postings and the index are on disk.
+    """
+
+    def __init__(self, archive: AuditArchive, after_days: int, chunk_size: int, chunk_pause: float, interval: float):
+        self.archive = archive
+        self.after_days = after_days
+        self.chunk_size = chunk_size
+        self.chunk_pause = chunk_pause
+        self.interval = interval
+        self.archived_rows = 0
+        self.chunks = 0
+        self.last_run: Optional[Dict] = None
+
+    async def run(self):
+        while True:
+            try:
+                await self.archive_due()
+            except Exception as e:
+                logger.error(f"Audit archiving failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def archive_due(self) -> int:
+        """Archive every row past the cutoff; returns rows moved (0 if another process holds the lock)"""
+        started = time.perf_counter()
+        moved = 0
+        async with AsyncSessionLocal() as lock_db:
+            lock_args = {"ns": ADVISORY_LOCK_NAMESPACE, "key": ARCHIVE_LOCK_KEY}
+            acquired = await lock_db.scalar(text("SELECT pg_try_advisory_lock(:ns, :key)"), lock_args)
+            # The lock is session-level; end the implicit transaction so this session
+            # does not sit idle in transaction, holding back vacuum, for the whole run
+            await lock_db.commit()
+            if not acquired:
+                return 0
+            try:
+                while True:
+                    archived = await self._archive_chunk()
+                    moved += archived
+                    if archived < self.chunk_size:
+                        break
+                    await asyncio.sleep(self.chunk_pause)
+            finally:
+                await lock_db.execute(text("SELECT pg_advisory_unlock(:ns, :key)"), lock_args)
+                await lock_db.commit()
+
+        self.last_run = {
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "rows": moved,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        if moved:
+            logger.info(f"Archived {moved} audit_logs rows older than {self.after_days} days")
+        return moved
+
+    async def _archive_chunk(self) -> int:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(SELECT_CHUNK_SQL, {"days": self.after_days, "limit": self.chunk_size})
+            rows = [dict(row._mapping) for row in result]
+            if not rows:
+                return 0
+            # Deleted first and committed right after the files are published, so a
+            # crash leaves the rows in the table or in the archive, not in both for long
+            await db.execute(
+                text("DELETE FROM audit_logs WHERE id = ANY(:ids)"),
+                {"ids": [row["id"] for row in rows]}
+            )
+            await asyncio.to_thread(self.archive.write_chunk, rows)
+            await db.commit()
+        self.chunks += 1
+        self.archived_rows += len(rows)
+        return len(rows)
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": settings.AUDIT_ARCHIVE_ENABLED,
+            "after_days": self.after_days,
+            "archived_rows": self.archived_rows,
+            "chunks": self.chunks,
+            "last_run": self.last_run,
+            "archive": self.archive.stats(),
+        }
+
+
+audit_archive = AuditArchive(get_archive_dir())
+audit_archiver = AuditArchiver(
+    audit_archive,
+    after_days=settings.AUDIT_ARCHIVE_AFTER_DAYS,
+    chunk_size=settings.AUDIT_ARCHIVE_CHUNK_SIZE,
+    chunk_pause=settings.AUDIT_ARCHIVE_CHUNK_PAUSE_MS / 1000,
+    interval=settings.AUDIT_ARCHIVE_INTERVAL_SECONDS
+)
+
+
+def main():
+    async def archive_once():
+        from app.db.base import engine
+
+        try:
+            moved = await audit_archiver.archive_due()
+        finally:
+            await engine.dispose()
+        print(f"Archived {moved} rows into {audit_archive.directory}")
+
+    asyncio.run(archive_once())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,19 @@
 import json
 import logging
-from typing import Optional, Dict, Any
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Tuple
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from app.models import AuditLog
-# from app.core.simple_logger import file_logger  # Temporarily disabled
+from app.core.audit_sink import get_audit_sink
 
 audit_logger = logging.getLogger("audit")
 chemical_logger = logging.getLogger("chemicals")
 
+# Session.info key holding file audit entries until the transaction commits
+PENDING_FILE_ENTRIES = "pending_audit_file_entries"
+
 
 class AuditService:
     @staticmethod
@@ -31,18 +37,61 @@ class AuditService:
         )
         db.add(audit_log)
         await db.flush()
-        
-        # File logging temporarily disabled to fix API
-        # Will re-enable after fixing initialization issue
-        pass
-        
+
+        AuditService.queue_file_entry(db, audit_log)
+
         return audit_log
-    
+
+    @staticmethod
+    async def log_operations(
+        db: AsyncSession,
+        table_name: str,
+        operation: str,
+        entries: List[Tuple[int, Optional[Dict[Any, Any]], Optional[Dict[Any, Any]]]],
+        user_info: Optional[str] = None
+    ) -> List[AuditLog]:
+        """Audit several (record_id, old_values, new_values) entries with one batched INSERT"""
+        audit_logs = [
+            AuditLog(
+                table_name=table_name,
+                operation=operation,
+                record_id=record_id,
+                old_values=json.dumps(old_values, default=str) if old_values else None,
+                new_values=json.dumps(new_values, default=str) if new_values else None,
+                user_info=user_info
+            )
+            for record_id, old_values, new_values in entries
+        ]
+        db.add_all(audit_logs)
+        await db.flush()
+
+        for audit_log in audit_logs:
+            AuditService.queue_file_entry(db, audit_log)
+
+        return audit_logs
+
+    @staticmethod
+    def queue_file_entry(db: AsyncSession, audit_log: AuditLog):
+        """Hold the file audit entry until commit so rolled back rows never reach the segments"""
+        if get_audit_sink() is None:
+            return
+
+        db.info.setdefault(PENDING_FILE_ENTRIES, []).append({
+            "id": audit_log.id,
+            "table_name": audit_log.table_name,
+            "operation": audit_log.operation,
+            "record_id": audit_log.record_id,
+            "old_values": audit_log.old_values,
+            "new_values": audit_log.new_values,
+            "user_info": audit_log.user_info,
+            "logged_at": datetime.now(timezone.utc).isoformat()
+        })
+
     @staticmethod
     def serialize_model(model_instance) -> Dict[Any, Any]:
         if not model_instance:
             return {}
-        
+
         result = {}
         for column in model_instance.__table__.columns:
             try:
@@ -51,4 +100,28 @@ class AuditService:
                     result[column.name] = str(value) if not isinstance(value, (str, int, float, bool)) else value
             except Exception:
                 continue
-        return result
\ No newline at end of file
+        return result
+
+    @staticmethod
+    def serialize_row(row: Dict[str, Any]) -> Dict[Any, Any]:
+        """serialize_model for plain column/value mappings such as RETURNING rows"""
+        return {
+            key: value if isinstance(value, (str, int, float, bool)) else str(value)
+            for key, value in row.items()
+            if value is not None
+        }
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_file_entries(session: Session):
+    entries = session.info.pop(PENDING_FILE_ENTRIES, None)
+    sink = get_audit_sink()
+    if not entries or sink is None:
+        return
+    for entry in entries:
+        sink.submit(entry)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_file_entries(session: Session, previous_transaction):
+    session.info.pop(PENDING_FILE_ENTRIES, None)
@@ -0,0 +1,110 @@
+"""Replay file audit segments against the audit_logs table.
+
+    python -m app.services.audit_verify [--dir logs/audit] [--since-id 0]
+
+Reports entries whose row is missing or differs in the database, audit_logs
+rows inside the covered id range that are missing from the segments, and
+unreadable lines. Rows already moved to the audit archive are checked there. Exits with status 1 when any discrepancy is found.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+import asyncpg
+from app.core.config import settings
+from app.core.audit_sink import get_audit_dir, list_segments, open_segment
+from app.services.audit_archive import audit_archive
+
+COMPARED_FIELDS = ("table_name", "operation", "record_id", "old_values", "new_values", "user_info")
+CHUNK_SIZE = 1000
+
+
+def read_segments(directory: Path, since_id: int):
+    entries: Dict[int, Dict] = {}
+    malformed: List[str] = []
+    segments = list_segments(directory)
+
+    for path in segments:
+        with open_segment(path) as f:
+            for line_number, line in enumerate(f, start=1):
+                try:
+                    entry = json.loads(line)
+                    audit_id = int(entry["id"])
+                except (ValueError, KeyError, TypeError):
+                    # A torn final line after a crash is expected in the active segment
+                    malformed.append(f"{path.name}:{line_number}")
+                    continue
+                if audit_id >= since_id:
+                    entries[audit_id] = entry
+    return segments, entries, malformed
+
+
+async def verify(directory: Path, since_id: int) -> int:
+    segments, entries, malformed = read_segments(directory, since_id)
+    print(f"Read {len(entries)} entries from {len(segments)} segment(s) in {directory}")
+    if not entries:
+        return 1 if malformed else 0
+
+    conn = await asyncpg.connect(
+        host=settings.DATABASE_HOST,
+        port=settings.DATABASE_PORT,
+        user=settings.DATABASE_USER,
+        password=settings.DATABASE_PASSWORD,
+        database=settings.DATABASE_NAME
+    )
+    try:
+        ids = sorted(entries)
+        rows = {}
+        for start in range(0, len(ids), CHUNK_SIZE):
+            chunk = ids[start:start + CHUNK_SIZE]
+            for row in await conn.fetch(
+                f"SELECT id, {', '.join(COMPARED_FIELDS)} FROM audit_logs WHERE id = ANY($1::int[])",
+                chunk
+            ):
+                rows[row["id"]] = row
+
+        unlogged = await conn.fetch(
+            "SELECT id FROM audit_logs WHERE id BETWEEN $1 AND $2 AND NOT (id = ANY($3::int[])) ORDER BY id",
+            ids[0], ids[-1], ids
+        )
+    finally:
+        await conn.close()
+
+    # Rows moved to the cold tier are compared against their archived copy
+    archived = audit_archive.rows_by_id(audit_id for audit_id in ids if audit_id not in rows)
+    rows.update(archived)
+
+    missing_in_db = [audit_id for audit_id in ids if audit_id not in rows]
+    mismatched = []
+    for audit_id, row in rows.items():
+        entry = entries[audit_id]
+        diffs = [field for field in COMPARED_FIELDS if entry.get(field) != row[field]]
+        if diffs:
+            mismatched.append((audit_id, diffs))
+    missing_in_files = [row["id"] for row in unlogged]
+
+    print(f"Matched:          {len(rows) - len(mismatched)}")
+    print(f"  (archived):     {len(archived)}")
+    print(f"Mismatched:       {len(mismatched)}")
+    for audit_id, diffs in mismatched[:20]:
+        print(f"   id {audit_id}: {', '.join(diffs)}")
+    print(f"Missing in DB:    {len(missing_in_db)} {missing_in_db[:20] if missing_in_db else ''}")
+    print(f"Missing in files: {len(missing_in_files)} {missing_in_files[:20] if missing_in_files else ''}")
+    print(f"Malformed lines:  {len(malformed)} {malformed[:20] if malformed else ''}")
+
+    return 1 if (mismatched or missing_in_db or missing_in_files or malformed) else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify file audit segments against audit_logs")
+    parser.add_argument("--dir", type=Path, default=None, help="Segment directory (default: AUDIT_FILE_DIR or logs/audit)")
+    parser.add_argument("--since-id", type=int, default=0, help="Ignore entries with a lower audit id")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(verify(args.dir or get_audit_dir(), args.since_id)))
+
+
+if __name__ == "__main__":
+    main()
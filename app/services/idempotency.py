@@ -0,0 +1,246 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, delete, update, func, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app.models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+MAX_KEY_LENGTH = 255
+PURGE_CHUNK_SIZE = 5000
+REPLAY_HEADER = "Idempotent-Replayed"
+
+
+@dataclass
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    body: Any
+    expires_at: float  # time.time() seconds
+
+
+class IdempotencyService:
+    """Replays stored responses for repeated Idempotency-Key requests.
+
+    The key row is claimed in the request's own transaction before the write
+    runs and completed with the response before that transaction commits, so
+    a write and its key commit or roll back together. A duplicate on another
+    worker blocks on the uncommitted claim and then replays the response.
+    Within this process, lookups go through an LRU cache first and concurrent
+    duplicates wait for the first execution without touching the database.
+    """
+
+    def __init__(self, ttl_seconds: int, cache_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str], StoredResponse]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    async def execute(
+        self,
+        key: str,
+        scope: str,
+        payload: Any,
+        db: AsyncSession,
+        handler: Callable[[], Awaitable[Any]],
+        response_model=None
+    ):
+        """Run ``handler`` at most once per key; it writes through ``db`` and must not commit"""
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"
+            )
+
+        request_hash = hashlib.sha256(
+            json.dumps(jsonable_encoder(payload), sort_keys=True).encode()
+        ).hexdigest()
+        cache_key = (scope, key)
+
+        while True:
+            stored = self._cache_get(cache_key)
+            if stored is not None:
+                return self._replay(stored, request_hash)
+
+            in_flight = self._in_flight.get(cache_key)
+            if in_flight is None:
+                break
+            try:
+                stored = await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if in_flight.cancelled():
+                    # The first execution was cancelled - try again ourselves
+                    continue
+                raise
+            return self._replay(stored, request_hash)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[cache_key] = future
+        try:
+            expires_at = time.time() + self.ttl_seconds
+            stored = await self._claim(db, scope, key, request_hash, expires_at)
+            if stored is not None:
+                self._cache_put(cache_key, stored)
+                future.set_result(stored)
+                return self._replay(stored, request_hash)
+
+            result = await handler()
+            if response_model is not None:
+                result = response_model.model_validate(result)
+            body = jsonable_encoder(result)
+
+            stored = StoredResponse(
+                request_hash=request_hash,
+                status_code=status.HTTP_200_OK,
+                body=body,
+                expires_at=expires_at
+            )
+            await self._complete(db, scope, key, stored)
+            await db.commit()
+            self._cache_put(cache_key, stored)
+            future.set_result(stored)
+            return body
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            # Rolls the claim back with the write, so a retry runs again
+            await db.rollback()
+            # A 422 from replaying a stored response comes after the result is set
+            if not future.done():
+                future.set_exception(e)
+                # Waiters re-raise it; mark it retrieved for the no-waiter case
+                future.exception()
+            raise
+        finally:
+            self._in_flight.pop(cache_key, None)
+
+    def _replay(self, stored: StoredResponse, request_hash: str) -> JSONResponse:
+        if stored.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request"
+            )
+        return JSONResponse(
+            status_code=stored.status_code,
+            content=stored.body,
+            headers={REPLAY_HEADER: "true"}
+        )
+
+    def _cache_get(self, cache_key: Tuple[str, str]) -> Optional[StoredResponse]:
+        stored = self._cache.get(cache_key)
+        if stored is None:
+            return None
+        if stored.expires_at <= time.time():
+            del self._cache[cache_key]
+            return None
+        self._cache.move_to_end(cache_key)
+        return stored
+
+    def _cache_put(self, cache_key: Tuple[str, str], stored: StoredResponse):
+        self._cache[cache_key] = stored
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _claim(
+        self, db: AsyncSession, scope: str, key: str, request_hash: str, expires_at: float
+    ) -> Optional[StoredResponse]:
+        """Claim the key in ``db``'s transaction (None) or return the response stored for it"""
+        statement = insert(IdempotencyKey).values(
+            key=key,
+            scope=scope,
+            request_hash=request_hash,
+            expires_at=datetime.fromtimestamp(expires_at, timezone.utc)
+        )
+        # Blocks while another transaction holds an uncommitted claim on the key.
+        # Only an expired, not yet purged row may be claimed again
+        statement = statement.on_conflict_do_update(
+            index_elements=[IdempotencyKey.key, IdempotencyKey.scope],
+            set_={
+                "request_hash": statement.excluded.request_hash,
+                "status_code": None,
+                "response_body": None,
+                "created_at": func.now(),
+                "expires_at": statement.excluded.expires_at
+            },
+            where=IdempotencyKey.expires_at <= func.now()
+        ).returning(IdempotencyKey.key)
+
+        while True:
+            if (await db.execute(statement)).first() is not None:
+                return None
+            # Read committed: this statement sees the row the claim waited for
+            result = await db.execute(
+                select(IdempotencyKey).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+            )
+            row = result.scalar_one_or_none()
+            if row is None:
+                # Purged in between; claim it afresh
+                continue
+            return StoredResponse(
+                request_hash=row.request_hash,
+                status_code=row.status_code,
+                body=json.loads(row.response_body),
+                expires_at=row.expires_at.timestamp()
+            )
+
+    async def _complete(self, db: AsyncSession, scope: str, key: str, stored: StoredResponse):
+        await db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+            .values(status_code=stored.status_code, response_body=json.dumps(stored.body))
+        )
+
+    async def purge_expired(self) -> int:
+        """Delete expired keys in small chunks and return the number removed"""
+        now = time.time()
+        for cache_key in [k for k, v in self._cache.items() if v.expires_at <= now]:
+            del self._cache[cache_key]
+
+        removed = 0
+        async with AsyncSessionLocal() as db:
+            while True:
+                expired = (
+                    select(IdempotencyKey.key, IdempotencyKey.scope)
+                    .where(IdempotencyKey.expires_at <= datetime.now(timezone.utc))
+                    .limit(PURGE_CHUNK_SIZE)
+                )
+                result = await db.execute(
+                    delete(IdempotencyKey).where(
+                        tuple_(IdempotencyKey.key, IdempotencyKey.scope).in_(expired)
+                    )
+                )
+                await db.commit()
+                removed += result.rowcount
+                if result.rowcount < PURGE_CHUNK_SIZE:
+                    return removed
+
+    async def run_purge_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                removed = await self.purge_expired()
+                if removed:
+                    logger.info(f"Purged {removed} expired idempotency keys")
+            except Exception as e:
+                logger.error(f"Idempotency key purge failed: {e}")
+
+
+idempotency = IdempotencyService(
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+    cache_size=settings.IDEMPOTENCY_CACHE_SIZE
+)
@@ -0,0 +1,189 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+from fastapi import HTTPException, status
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import schemas
+from app.core.config import settings
+from app.core.units import to_base
+from app.db.base import AsyncSessionLocal
+from app.models import Chemical, InventoryLog
+from app.services.audit_service import AuditService
+
+logger = logging.getLogger(__name__)
+
+RETURNING_COLUMNS = (
+    InventoryLog.id,
+    InventoryLog.chemical_id,
+    InventoryLog.action_type,
+    InventoryLog.quantity,
+    InventoryLog.base_quantity,
+    InventoryLog.timestamp,
+)
+
+
+@dataclass
+class PendingLog:
+    chemical_id: int
+    log_entry: schemas.InventoryLogCreate
+    future: asyncio.Future
+
+
+class InventoryLogBatcher:
+    """Coalesces concurrent inventory log writes into one transaction.
+
+    Requests wait at most ``max_delay`` seconds (or until ``max_batch_size``
+    are queued); each batch is one existence check, one multi-row INSERT, one
+    audit INSERT and one commit. Every caller gets its own row or error.
+    """
+
+    def __init__(self, max_batch_size: int, max_delay: float):
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: List[PendingLog] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        self.batches = 0
+        self.items = 0
+        self.max_batch = 0
+        self.fallbacks = 0
+
+    async def submit(self, chemical_id: int, log_entry: schemas.InventoryLogCreate) -> Dict:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._full = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(PendingLog(chemical_id, log_entry, future))
+        self._wakeup.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        return await future
+
+    async def stop(self):
+        """Write everything already queued, then stop the collector"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        self._full.set()
+        await self._task
+        self._task = None
+        self._stopping = False
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": settings.INVENTORY_LOG_BATCHING,
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "items": self.items,
+            "average_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch,
+            "fallbacks": self.fallbacks,
+        }
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            if self._stopping and not self._pending:
+                return
+            if len(self._pending) < self.max_batch_size and not self._stopping:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch, self._pending = self._pending[:self.max_batch_size], self._pending[self.max_batch_size:]
+            if not self._pending and not self._stopping:
+                self._wakeup.clear()
+            if len(self._pending) < self.max_batch_size and not self._stopping:
+                self._full.clear()
+
+            # Skip callers that gave up while waiting
+            batch = [item for item in batch if not item.future.done()]
+            if batch:
+                await self._flush(batch)
+
+    async def _flush(self, batch: List[PendingLog]):
+        self.batches += 1
+        self.items += len(batch)
+        self.max_batch = max(self.max_batch, len(batch))
+
+        try:
+            async with AsyncSessionLocal() as db:
+                results = await write_inventory_logs(db, batch)
+        except Exception as e:
+            if len(batch) == 1:
+                results = [e]
+            else:
+                # One bad row must not fail its neighbours: retry each on its own
+                logger.warning(f"Inventory log batch of {len(batch)} failed, retrying individually: {e}")
+                self.fallbacks += 1
+                results = []
+                for item in batch:
+                    try:
+                        async with AsyncSessionLocal() as db:
+                            results.extend(await write_inventory_logs(db, [item]))
+                    except Exception as item_error:
+                        results.append(item_error)
+
+        for item, result in zip(batch, results):
+            if item.future.done():
+                continue
+            if isinstance(result, Exception):
+                item.future.set_exception(result)
+            else:
+                item.future.set_result(result)
+
+
+async def write_inventory_logs(db: AsyncSession, batch: List[PendingLog]) -> List[Union[Dict, Exception]]:
+    chemical_ids = {item.chemical_id for item in batch}
+    result = await db.execute(
+        select(Chemical.id, Chemical.unit).where(Chemical.id.in_(chemical_ids), Chemical.deleted_at.is_(None))
+    )
+    existing = dict(result.all())
+
+    valid = [item for item in batch if item.chemical_id in existing]
+    rows = []
+    if valid:
+        result = await db.execute(
+            insert(InventoryLog).returning(*RETURNING_COLUMNS, sort_by_parameter_order=True),
+            [
+                {
+                    "chemical_id": item.chemical_id,
+                    "base_quantity": to_base(item.log_entry.quantity, existing[item.chemical_id])[0],
+                    **item.log_entry.dict()
+                }
+                for item in valid
+            ]
+        )
+        rows = [dict(row._mapping) for row in result]
+
+        await AuditService.log_operations(
+            db=db,
+            table_name="inventory_logs",
+            operation="CREATE",
+            entries=[(row["id"], None, AuditService.serialize_row(row)) for row in rows]
+        )
+        await db.commit()
+
+    written = iter(rows)
+    return [
+        next(written) if item.chemical_id in existing else HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Chemical with id {item.chemical_id} not found"
+        )
+        for item in batch
+    ]
+
+
+log_batcher = InventoryLogBatcher(
+    max_batch_size=settings.INVENTORY_LOG_BATCH_MAX_SIZE,
+    max_delay=settings.INVENTORY_LOG_BATCH_MAX_DELAY_MS / 1000
+)
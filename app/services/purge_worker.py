@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from sqlalchemy import text
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+
+# Namespace for pg advisory locks held while a job is processed
+ADVISORY_LOCK_NAMESPACE = 0x5D5
+
+
+class PurgeWorker:
+    """Deletes the history of soft-deleted chemicals in small throttled chunks.
+
+    Progress is committed with every chunk and jobs are claimed with a
+    session-level advisory lock, so a job interrupted by a restart (or held by
+    a crashed worker) is picked up again where it stopped.
+    """
+
+    def __init__(self, chunk_size: int, chunk_pause: float, poll_interval: float):
+        self.chunk_size = chunk_size
+        self.chunk_pause = chunk_pause
+        self.poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+
+    def wake(self):
+        self._wakeup.set()
+
+    async def run(self):
+        while True:
+            try:
+                processed = await self.process_next()
+            except Exception as e:
+                logger.error(f"Purge worker error: {e}")
+                processed = False
+
+            if not processed:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def process_next(self) -> bool:
+        """Claim and run one unfinished job; returns False when there is none"""
+        async with engine.connect() as lock_conn:
+            candidates = await lock_conn.execute(text(
+                "SELECT id, chemical_id FROM purge_jobs "
+                "WHERE status IN ('pending', 'running') ORDER BY id LIMIT 20"
+            ))
+            await lock_conn.commit()
+
+            for job_id, chemical_id in candidates.all():
+                locked = await lock_conn.scalar(
+                    text("SELECT pg_try_advisory_lock(:ns, :id)"),
+                    {"ns": ADVISORY_LOCK_NAMESPACE, "id": job_id}
+                )
+                await lock_conn.commit()
+                if not locked:
+                    continue
+                try:
+                    await self._run_job(job_id, chemical_id)
+                finally:
+                    await lock_conn.execute(
+                        text("SELECT pg_advisory_unlock(:ns, :id)"),
+                        {"ns": ADVISORY_LOCK_NAMESPACE, "id": job_id}
+                    )
+                    await lock_conn.commit()
+                return True
+        return False
+
+    async def _run_job(self, job_id: int, chemical_id: int):
+        async with AsyncSessionLocal() as db:
+            status = await db.scalar(text("SELECT status FROM purge_jobs WHERE id = :id"), {"id": job_id})
+            if status not in ("pending", "running"):
+                return
+
+            if status == "pending":
+                total = await db.scalar(
+                    text("SELECT COUNT(*) FROM inventory_logs WHERE chemical_id = :cid"),
+                    {"cid": chemical_id}
+                )
+                await db.execute(
+                    text("UPDATE purge_jobs SET status = 'running', total_rows = :total, "
+                         "attempts = attempts + 1, updated_at = now() WHERE id = :id"),
+                    {"id": job_id, "total": total}
+                )
+            else:
+                await db.execute(
+                    text("UPDATE purge_jobs SET attempts = attempts + 1, updated_at = now() WHERE id = :id"),
+                    {"id": job_id}
+                )
+            await db.commit()
+
+        logger.info(f"Purging history of chemical {chemical_id} (job {job_id})")
+        try:
+            while True:
+                deleted = await self._delete_chunk(job_id, chemical_id)
+                if deleted < self.chunk_size:
+                    break
+                await asyncio.sleep(self.chunk_pause)
+
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    text("DELETE FROM chemicals WHERE id = :cid AND deleted_at IS NOT NULL"),
+                    {"cid": chemical_id}
+                )
+                await db.execute(
+                    text("UPDATE purge_jobs SET status = 'completed', completed_at = now(), "
+                         "updated_at = now(), last_error = NULL WHERE id = :id"),
+                    {"id": job_id}
+                )
+                await db.commit()
+            logger.info(f"Purge job {job_id} completed")
+        except Exception as e:
+            logger.error(f"Purge job {job_id} failed: {e}")
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    text("UPDATE purge_jobs SET last_error = :error, updated_at = now(), "
+                         "status = CASE WHEN attempts >= :max_attempts THEN 'failed' ELSE status END "
+                         "WHERE id = :id"),
+                    {"id": job_id, "error": str(e), "max_attempts": MAX_ATTEMPTS}
+                )
+                await db.commit()
+            raise
+
+    async def _delete_chunk(self, job_id: int, chemical_id: int) -> int:
+        # Each chunk and its progress update commit together
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                text("DELETE FROM inventory_logs WHERE id IN ("
+                     "SELECT id FROM inventory_logs WHERE chemical_id = :cid LIMIT :limit)"),
+                {"cid": chemical_id, "limit": self.chunk_size}
+            )
+            deleted = result.rowcount
+            await db.execute(
+                text("UPDATE purge_jobs SET deleted_rows = deleted_rows + :deleted, updated_at = now() "
+                     "WHERE id = :id"),
+                {"id": job_id, "deleted": deleted}
+            )
+            await db.commit()
+        return deleted
+
+
+purge_worker = PurgeWorker(
+    chunk_size=settings.PURGE_CHUNK_SIZE,
+    chunk_pause=settings.PURGE_CHUNK_PAUSE_MS / 1000,
+    poll_interval=settings.PURGE_POLL_INTERVAL_SECONDS
+)
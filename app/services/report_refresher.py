@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import time
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app.models import ReportRefresh
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_VIEW = "chemical_activity_summary"
+
+# Namespace for pg advisory locks serialising refreshes across workers
+ADVISORY_LOCK_NAMESPACE = 0x5D6
+SUMMARY_LOCK_KEY = 1
+
+
+class ReportRefresher:
+    """Keeps the report materialized view at most ``interval`` seconds old.
+
+    Every worker runs the loop, but a transaction-level advisory lock and the
+    shared report_refreshes timestamp mean one refresh per interval for the
+    whole fleet. REFRESH ... CONCURRENTLY leaves the view readable throughout.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.refreshes = 0
+        self.last_duration_ms = None
+
+    async def run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Report refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Refresh if due (or unconditionally when forced); returns whether this call refreshed.
+
+        A forced refresh waits for one already running and is skipped if that
+        one started after this request did.
+        """
+        async with AsyncSessionLocal() as db:
+            lock_args = {"ns": ADVISORY_LOCK_NAMESPACE, "key": SUMMARY_LOCK_KEY}
+            if force:
+                await db.execute(text("SELECT pg_advisory_xact_lock(:ns, :key)"), lock_args)
+            elif not await db.scalar(text("SELECT pg_try_advisory_xact_lock(:ns, :key)"), lock_args):
+                return False
+
+            # now() is the start of this transaction, i.e. before any lock wait
+            fresh = await db.scalar(
+                text(
+                    "SELECT refreshed_at >= now() - make_interval(secs => :max_age) "
+                    "FROM report_refreshes WHERE view_name = :view"
+                ),
+                {"view": SUMMARY_VIEW, "max_age": 0 if force else self.interval * 0.9}
+            )
+            if fresh:
+                await db.rollback()
+                return False
+
+            started = time.perf_counter()
+            await db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {SUMMARY_VIEW}"))
+            duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+            statement = insert(ReportRefresh).values(
+                view_name=SUMMARY_VIEW,
+                refreshed_at=text("now()"),
+                duration_ms=duration_ms
+            )
+            await db.execute(statement.on_conflict_do_update(
+                index_elements=[ReportRefresh.view_name],
+                set_={"refreshed_at": statement.excluded.refreshed_at, "duration_ms": duration_ms}
+            ))
+            await db.commit()
+
+        self.refreshes += 1
+        self.last_duration_ms = duration_ms
+        logger.info(f"Refreshed {SUMMARY_VIEW} in {duration_ms}ms")
+        return True
+
+
+report_refresher = ReportRefresher(interval=settings.REPORT_REFRESH_INTERVAL_SECONDS)
@@ -0,0 +1,172 @@
+"""Cold-start benchmark: how long until a fresh process serves traffic.
+
+Each run starts new interpreters, so nothing is shared with earlier runs:
+
+    import          python -c "import app.main"
+    migrate_check   python -m app.db.migrate --check  (only with --with-db)
+    serve           spawn uvicorn until GET /health (or /ready with --with-db)
+                    answers 200, then SIGTERM until the process exits
+
+The process exits non-zero when the median time to serve exceeds --target,
+or when --compare finds a regression against a saved baseline.
+
+    python -m benchmarks.cold_start --runs 5 --target 3
+    python -m benchmarks.cold_start --with-db --save-baseline
+"""
+import argparse
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.common import BASELINE_DIR, load_json, run_metadata, save_json
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = BASELINE_DIR / "cold_start.json"
+DEFAULT_TARGET_SECONDS = 3.0
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def timed_run(args: List[str], env: Dict[str, str]) -> float:
+    started = time.perf_counter()
+    subprocess.run(args, cwd=REPO_ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def timed_serve(env: Dict[str, str], path: str, timeout: float) -> Dict[str, float]:
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=REPO_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        url = f"http://127.0.0.1:{port}{path}"
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {process.returncode} before serving")
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError(f"{path} did not answer 200 within {timeout}s")
+            try:
+                if httpx.get(url, timeout=1.0).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            time.sleep(0.01)
+        serve = time.perf_counter() - started
+
+        stopping = time.perf_counter()
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=timeout)
+        return {"serve": serve, "shutdown": time.perf_counter() - stopping}
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+def summarize(samples: Dict[str, List[float]]) -> Dict:
+    return {
+        phase: {
+            "runs": len(values),
+            "median_s": round(statistics.median(values), 4),
+            "min_s": round(min(values), 4),
+            "max_s": round(max(values), 4),
+        }
+        for phase, values in samples.items()
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Return a list of human readable regressions (empty when within tolerance)"""
+    regressions = []
+    for phase, base in baseline["phases"].items():
+        stats = current["phases"].get(phase)
+        if stats and base["median_s"] > 0 and stats["median_s"] > base["median_s"] * (1 + tolerance):
+            regressions.append(
+                f"{phase}: median {stats['median_s']:.3f}s > baseline {base['median_s']:.3f}s (+{tolerance:.0%} allowed)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the SDS Chemical Inventory API")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--with-db", action="store_true",
+                        help="Also time the migration check and wait for /ready instead of /health")
+    parser.add_argument("--target", type=float, default=DEFAULT_TARGET_SECONDS,
+                        help=f"Maximum median seconds until serving (default: {DEFAULT_TARGET_SECONDS})")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="Write this run's results to a JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the baseline")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline path for --save-baseline")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    # Match production: no per-statement SQL logging
+    env = {**os.environ, "SQL_ECHO": "false", "PYTHONDONTWRITEBYTECODE": "1"}
+    samples: Dict[str, List[float]] = {"import": [], "serve": [], "shutdown": []}
+    if args.with_db:
+        samples["migrate_check"] = []
+
+    for run in range(1, args.runs + 1):
+        samples["import"].append(timed_run([sys.executable, "-c", "import app.main"], env))
+        if args.with_db:
+            samples["migrate_check"].append(timed_run([sys.executable, "-m", "app.db.migrate", "--check"], env))
+        for phase, seconds in timed_serve(env, "/ready" if args.with_db else "/health", args.timeout).items():
+            samples[phase].append(seconds)
+        print(f"Run {run}/{args.runs}: " + ", ".join(f"{phase} {values[-1]:.3f}s" for phase, values in samples.items()))
+
+    result = {
+        "phases": summarize(samples),
+        "meta": run_metadata(runs=args.runs, with_db=args.with_db, target_s=args.target)
+    }
+
+    print(f"\n{'phase':<15}{'median':>10}{'min':>10}{'max':>10}")
+    for phase, stats in result["phases"].items():
+        print(f"{phase:<15}{stats['median_s']:>9.3f}s{stats['min_s']:>9.3f}s{stats['max_s']:>9.3f}s")
+
+    if args.output:
+        save_json(args.output, result)
+    if args.save_baseline:
+        save_json(args.baseline, result)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    status = 0
+    serve_median = result["phases"]["serve"]["median_s"]
+    if serve_median > args.target:
+        print(f"\nFAILED: median time to serve {serve_median:.3f}s exceeds the {args.target:.1f}s target")
+        status = 1
+    else:
+        print(f"\nOK: median time to serve {serve_median:.3f}s within the {args.target:.1f}s target")
+
+    if args.compare:
+        regressions = compare(result, load_json(args.compare), args.tolerance)
+        if regressions:
+            print(f"\nFAILED: {len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print(f"   {line}")
+            status = 1
+        else:
+            print(f"OK: within {args.tolerance:.0%} of baseline {args.compare}")
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
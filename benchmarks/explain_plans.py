@@ -0,0 +1,256 @@
+"""Check that the endpoint queries are served by indexes, not sorts or full scans.
+
+Seeds a realistic volume of chemicals, inventory logs and audit logs into the
+database configured via the usual DATABASE_* settings, runs ANALYZE, then
+EXPLAINs each endpoint query and fails when a plan contains a Sort node, a
+Seq Scan on the queried table, or does not use the index it is expected to.
+Seeded rows are removed afterwards unless --keep is given.
+
+    python -m benchmarks.explain_plans
+    python -m benchmarks.explain_plans --chemicals 5000 --logs-per-chemical 200 --verbose
+"""
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from benchmarks.common import run_metadata, save_json
+
+SEED_PREFIX = "EXPLAIN-"
+SEED_USER = "explain-plans"
+SORT_NODES = {"Sort", "Incremental Sort"}
+
+
+@dataclass
+class PlanCheck:
+    name: str
+    sql: str
+    args: Sequence
+    table: str
+    # Acceptable indexes for the scans of ``table``; the first is the one designed for it
+    indexes: Sequence[str]
+
+
+def iter_nodes(node: Dict) -> Iterator[Dict]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from iter_nodes(child)
+
+
+def problems(plan: Dict, check: PlanCheck) -> List[str]:
+    """Human readable reasons the plan falls short (empty when it passes)"""
+    nodes = list(iter_nodes(plan))
+    found = []
+    if any(node["Node Type"] in SORT_NODES for node in nodes):
+        found.append("sorts rows instead of reading them in index order")
+    scans = [node for node in nodes if node.get("Relation Name") == check.table]
+    if any(node["Node Type"] == "Seq Scan" for node in scans):
+        found.append(f"sequentially scans {check.table}")
+    used = {node.get("Index Name") for node in nodes if node.get("Index Name")}
+    if not used & set(check.indexes):
+        found.append(f"uses none of {', '.join(check.indexes)} (used: {', '.join(sorted(used)) or 'no index'})")
+    return found
+
+
+def summarize_plan(plan: Dict) -> str:
+    return " -> ".join(
+        node["Node Type"] + (f" [{node['Index Name']}]" if node.get("Index Name") else "")
+        for node in iter_nodes(plan)
+    )
+
+
+def compile_orm(statement) -> str:
+    from sqlalchemy.dialects import postgresql
+
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def build_checks(chemical_id: int) -> List[PlanCheck]:
+    """The queries behind the read endpoints and the purge worker, with representative parameters"""
+    from sqlalchemy import select, func
+    from app.api.chemicals import READ_CHEMICAL_SQL, COUNT_LOGS_SQL, READ_LOGS_SQL
+    from app.models import AuditLog, Chemical
+
+    audit_page = select(AuditLog).order_by(AuditLog.timestamp.desc()).offset(20).limit(10)
+    return [
+        PlanCheck("GET /chemicals/{id}", READ_CHEMICAL_SQL, [chemical_id], "chemicals", ["chemicals_pkey"]),
+        PlanCheck("GET /chemicals/{id}/logs (count)", COUNT_LOGS_SQL, [chemical_id], "inventory_logs",
+                  ["ix_inventory_logs_chemical_timestamp"]),
+        PlanCheck("GET /chemicals/{id}/logs (page)", READ_LOGS_SQL, [chemical_id, 10, 20], "inventory_logs",
+                  ["ix_inventory_logs_chemical_timestamp"]),
+        PlanCheck(
+            "GET /chemicals/?min_quantity&quantity_unit",
+            compile_orm(
+                select(Chemical).where(
+                    Chemical.deleted_at.is_(None),
+                    Chemical.base_unit == "ml",
+                    Chemical.base_quantity >= 990.0,
+                    Chemical.base_quantity <= 1000.0
+                ).offset(0).limit(10)
+            ),
+            [], "chemicals", ["ix_chemicals_base_unit_quantity"]
+        ),
+        PlanCheck("GET /audit/logs", compile_orm(audit_page), [], "audit_logs", ["ix_audit_logs_timestamp"]),
+        PlanCheck(
+            "GET /audit/logs?table_name&operation",
+            compile_orm(audit_page.where(AuditLog.table_name == "chemicals", AuditLog.operation == "UPDATE")),
+            [], "audit_logs", ["ix_audit_logs_table_operation_timestamp"]
+        ),
+        PlanCheck(
+            "GET /audit/logs?table_name",
+            compile_orm(audit_page.where(AuditLog.table_name == "chemicals")),
+            [], "audit_logs", ["ix_audit_logs_table_operation_timestamp", "ix_audit_logs_timestamp"]
+        ),
+        PlanCheck(
+            "GET /audit/logs?operation",
+            compile_orm(audit_page.where(AuditLog.operation == "DELETE")),
+            [], "audit_logs", ["ix_audit_logs_timestamp", "ix_audit_logs_table_operation_timestamp"]
+        ),
+        PlanCheck(
+            "GET /audit/logs/record/{id} (count)",
+            compile_orm(select(func.count(AuditLog.id)).where(AuditLog.record_id == chemical_id)),
+            [], "audit_logs", ["ix_audit_logs_record_timestamp"]
+        ),
+        PlanCheck(
+            "GET /audit/logs/record/{id} (page)",
+            compile_orm(
+                select(AuditLog).where(AuditLog.record_id == chemical_id)
+                .order_by(AuditLog.timestamp.desc()).offset(0).limit(10)
+            ),
+            [], "audit_logs", ["ix_audit_logs_record_timestamp"]
+        ),
+        PlanCheck(
+            "purge worker chunk",
+            "SELECT id FROM inventory_logs WHERE chemical_id = $1 LIMIT $2",
+            [chemical_id, 1000], "inventory_logs", ["ix_inventory_logs_chemical_timestamp"]
+        ),
+    ]
+
+
+async def seed(conn, chemicals: int, logs_per_chemical: int, audit_rows: int) -> List[int]:
+    """Insert the seed rows with set-based SQL; returns the seeded chemical ids"""
+    from app.core.units import sql_base_unit, sql_factor
+
+    ids = await conn.fetch(f"""
+        INSERT INTO chemicals (name, cas_number, quantity, unit, base_quantity, base_unit)
+        SELECT s.name, s.cas_number, s.quantity, s.unit, s.quantity * {sql_factor("s.unit")}, {sql_base_unit("s.unit")}
+        FROM (
+            SELECT 'Explain ' || i AS name,
+                   '{SEED_PREFIX}' || i AS cas_number,
+                   (i % 1000)::double precision AS quantity,
+                   (ARRAY['ml', 'l', 'g', 'mg', 'kg', 'each'])[1 + i % 6] AS unit
+            FROM generate_series(1, $1) AS i
+        ) s
+        RETURNING id
+    """, chemicals)
+    ids = [row["id"] for row in ids]
+
+    # Logs arrive over 90 days in roughly timestamp order, like real traffic
+    await conn.execute("""
+        INSERT INTO inventory_logs (chemical_id, action_type, quantity, base_quantity, timestamp)
+        SELECT c.id,
+               (ARRAY['ADD', 'REMOVE', 'UPDATE'])[1 + (n % 3)]::actiontype,
+               1 + n % 50,
+               1 + n % 50,
+               now() - interval '90 days' * (1 - n::double precision / $2::integer)
+        FROM unnest($1::integer[]) AS c(id), generate_series(1, $2::integer) AS n
+        ORDER BY n, c.id
+    """, ids, logs_per_chemical)
+
+    # Mostly inventory log creates, then chemical updates, few creates/deletes
+    await conn.execute("""
+        INSERT INTO audit_logs (table_name, operation, record_id, new_values, timestamp, user_info)
+        SELECT CASE WHEN n % 10 < 6 THEN 'inventory_logs' ELSE 'chemicals' END,
+               CASE WHEN n % 10 < 6 THEN 'CREATE'
+                    WHEN n % 10 < 9 THEN 'UPDATE'
+                    WHEN n % 20 = 9 THEN 'CREATE'
+                    ELSE 'DELETE' END,
+               ($1::integer[])[1 + n % array_length($1::integer[], 1)],
+               '{}',
+               now() - interval '90 days' * (1 - n::double precision / $2::integer),
+               $3
+        FROM generate_series(1, $2::integer) AS n
+    """, ids, audit_rows, SEED_USER)
+
+    for table in ("chemicals", "inventory_logs", "audit_logs"):
+        await conn.execute(f"ANALYZE {table}")
+    return ids
+
+
+async def cleanup(conn):
+    seeded = f"SELECT id FROM chemicals WHERE cas_number LIKE '{SEED_PREFIX}%'"
+    await conn.execute(f"DELETE FROM inventory_logs WHERE chemical_id IN ({seeded})")
+    await conn.execute("DELETE FROM audit_logs WHERE user_info = $1", SEED_USER)
+    await conn.execute(f"DELETE FROM chemicals WHERE cas_number LIKE '{SEED_PREFIX}%'")
+
+
+async def explain(conn, check: PlanCheck) -> Dict:
+    result = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {check.sql}", *check.args)
+    return (json.loads(result) if isinstance(result, str) else result)[0]["Plan"]
+
+
+async def run(args) -> int:
+    from app.db.base import engine
+
+    results = {}
+    try:
+        async with engine.connect() as sa_conn:
+            conn = (await sa_conn.get_raw_connection()).driver_connection
+            await cleanup(conn)
+            print(f"Seeding {args.chemicals} chemicals, {args.chemicals * args.logs_per_chemical} inventory logs "
+                  f"and {args.audit_rows} audit logs...")
+            ids = await seed(conn, args.chemicals, args.logs_per_chemical, args.audit_rows)
+            try:
+                for check in build_checks(ids[len(ids) // 2]):
+                    plan = await explain(conn, check)
+                    found = problems(plan, check)
+                    results[check.name] = {"ok": not found, "problems": found, "plan": summarize_plan(plan)}
+                    print(f"{'OK  ' if not found else 'FAIL'} {check.name}")
+                    for problem in found:
+                        print(f"       {problem}")
+                    if found or args.verbose:
+                        print(f"       plan: {summarize_plan(plan)}")
+            finally:
+                if not args.keep:
+                    await cleanup(conn)
+    finally:
+        await engine.dispose()
+
+    if args.output:
+        save_json(args.output, {
+            "checks": results,
+            "meta": run_metadata(
+                chemicals=args.chemicals,
+                logs_per_chemical=args.logs_per_chemical,
+                audit_rows=args.audit_rows
+            )
+        })
+
+    failed = [name for name, result in results.items() if not result["ok"]]
+    if failed:
+        print(f"\nFAILED: {len(failed)} of {len(results)} queries are not index-served")
+        return 1
+    print(f"\nOK: all {len(results)} queries are index-served without sorting")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="EXPLAIN the endpoint queries against seeded data")
+    parser.add_argument("--chemicals", type=int, default=2000)
+    parser.add_argument("--logs-per-chemical", type=int, default=100)
+    parser.add_argument("--audit-rows", type=int, default=300_000)
+    parser.add_argument("--keep", action="store_true", help="Leave the seeded rows in place")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan, not just failing ones")
+    parser.add_argument("--output", help="Write the results to a JSON file")
+    args = parser.parse_args(argv)
+
+    # SQL echo would bury the report
+    import logging
+    logging.disable(logging.WARNING)
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
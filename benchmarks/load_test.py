@@ -0,0 +1,256 @@
+"""Concurrent load benchmark for a running API instance.
+
+Drives a weighted mix of scanner lookups, inventory log writes, list paging
+and audit queries at a fixed concurrency, then reports throughput and
+latency percentiles per endpoint. Results can be saved as a JSON baseline
+and later runs compared against it; the process exits non-zero when a run
+regresses beyond the tolerance.
+
+    python -m benchmarks.load_test --concurrency 32 --duration 30 \
+        --mix lookup=60,log=20,list=15,audit=5 --save-baseline
+    python -m benchmarks.load_test --compare benchmarks/baselines/load.json
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.common import BASELINE_DIR, load_json, percentile, run_metadata, save_json
+
+DEFAULT_BASELINE = BASELINE_DIR / "load.json"
+DEFAULT_MIX = "lookup=60,log=20,list=15,audit=5"
+
+
+class LoadRunner:
+    def __init__(self, client: httpx.AsyncClient, chemical_ids: List[int], mix: Dict[str, int]):
+        self.client = client
+        self.chemical_ids = chemical_ids
+        self.operations = list(mix.keys())
+        self.weights = list(mix.values())
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.recording = False
+
+    async def lookup(self):
+        chemical_id = random.choice(self.chemical_ids)
+        return await self.client.get(f"/api/v1/chemicals/{chemical_id}")
+
+    async def log(self):
+        chemical_id = random.choice(self.chemical_ids)
+        return await self.client.post(
+            f"/api/v1/chemicals/{chemical_id}/log",
+            json={"action_type": random.choice(["add", "remove"]), "quantity": 1.0}
+        )
+
+    async def list(self):
+        page = random.randint(1, max(1, len(self.chemical_ids) // 20))
+        return await self.client.get("/api/v1/chemicals/", params={"page": page, "page_size": 20})
+
+    async def audit(self):
+        return await self.client.get(
+            "/api/v1/audit/logs",
+            params={"table_name": "chemicals", "page": random.randint(1, 5), "page_size": 20}
+        )
+
+    async def worker(self, deadline: float):
+        while time.perf_counter() < deadline:
+            name = random.choices(self.operations, weights=self.weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await getattr(self, name)()
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            elapsed = time.perf_counter() - start
+
+            if not self.recording:
+                continue
+            self.latencies[name].append(elapsed * 1000)
+            if failed:
+                self.errors[name] += 1
+
+    async def run(self, concurrency: int, duration: float, warmup: float):
+        start = time.perf_counter()
+        deadline = start + warmup + duration
+        workers = [asyncio.create_task(self.worker(deadline)) for _ in range(concurrency)]
+
+        await asyncio.sleep(warmup)
+        self.recording = True
+        measured_start = time.perf_counter()
+        await asyncio.gather(*workers)
+        return time.perf_counter() - measured_start
+
+
+def summarize(latencies: Dict[str, List[float]], errors: Dict[str, int], elapsed: float) -> Dict:
+    endpoints = {}
+    all_latencies = []
+    for name, values in sorted(latencies.items()):
+        values.sort()
+        all_latencies.extend(values)
+        endpoints[name] = {
+            "requests": len(values),
+            "errors": errors.get(name, 0),
+            "throughput_rps": round(len(values) / elapsed, 2),
+            "mean_ms": round(sum(values) / len(values), 3),
+            "p50_ms": round(percentile(values, 50), 3),
+            "p95_ms": round(percentile(values, 95), 3),
+            "p99_ms": round(percentile(values, 99), 3),
+        }
+
+    all_latencies.sort()
+    total = {
+        "requests": len(all_latencies),
+        "errors": sum(errors.values()),
+        "throughput_rps": round(len(all_latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(all_latencies, 50), 3),
+        "p95_ms": round(percentile(all_latencies, 95), 3),
+        "p99_ms": round(percentile(all_latencies, 99), 3),
+    }
+    return {"endpoints": endpoints, "total": total}
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Return a list of human readable regressions (empty when within tolerance)"""
+    regressions = []
+    for name, base in baseline["endpoints"].items():
+        stats = current["endpoints"].get(name)
+        if stats is None:
+            continue
+
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if base[key] > 0 and stats[key] > base[key] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {key} {stats[key]:.2f} > baseline {base[key]:.2f} (+{tolerance:.0%} allowed)"
+                )
+
+        if stats["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {stats['throughput_rps']:.1f} rps < baseline {base['throughput_rps']:.1f} rps"
+            )
+
+        base_error_rate = base["errors"] / base["requests"] if base["requests"] else 0.0
+        error_rate = stats["errors"] / stats["requests"] if stats["requests"] else 0.0
+        if error_rate > base_error_rate + tolerance / 10:
+            regressions.append(f"{name}: error rate {error_rate:.2%} > baseline {base_error_rate:.2%}")
+    return regressions
+
+
+def print_report(result: Dict):
+    header = f"{'endpoint':<10} {'requests':>9} {'errors':>7} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    rows = list(result["endpoints"].items()) + [("TOTAL", result["total"])]
+    for name, stats in rows:
+        print(
+            f"{name:<10} {stats['requests']:>9} {stats['errors']:>7} {stats['throughput_rps']:>9.1f} "
+            f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+        )
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ("lookup", "log", "list", "audit"):
+            raise argparse.ArgumentTypeError(f"Unknown operation in mix: {name}")
+        mix[name] = int(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("Mix must contain at least one positive weight")
+    return mix
+
+
+async def seed_chemicals(client: httpx.AsyncClient, count: int) -> List[int]:
+    run_id = f"{int(time.time())}-{random.randint(1000, 9999)}"
+    ids = []
+    for i in range(count):
+        response = await client.post("/api/v1/chemicals/", json={
+            "name": f"Load test chemical {i}",
+            "cas_number": f"LOAD-{run_id}-{i}",
+            "quantity": 1000.0,
+            "unit": "ml"
+        })
+        response.raise_for_status()
+        ids.append(response.json()["id"])
+    return ids
+
+
+async def cleanup_chemicals(client: httpx.AsyncClient, ids: List[int]):
+    for chemical_id in ids:
+        await client.delete(f"/api/v1/chemicals/{chemical_id}")
+
+
+async def main_async(args) -> int:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        response = await client.get("/health")
+        response.raise_for_status()
+
+        print(f"Seeding {args.chemicals} chemicals...")
+        chemical_ids = await seed_chemicals(client, args.chemicals)
+
+        try:
+            print(f"Running mix {args.mix} at concurrency {args.concurrency} for {args.duration}s "
+                  f"(+{args.warmup}s warm-up)...\n")
+            runner = LoadRunner(client, chemical_ids, args.mix)
+            elapsed = await runner.run(args.concurrency, args.duration, args.warmup)
+        finally:
+            if not args.keep_data:
+                await cleanup_chemicals(client, chemical_ids)
+
+    result = summarize(runner.latencies, runner.errors, elapsed)
+    result["meta"] = run_metadata(
+        base_url=args.base_url,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        mix=args.mix,
+        chemicals=args.chemicals
+    )
+    print_report(result)
+
+    if args.output:
+        save_json(args.output, result)
+    if args.save_baseline:
+        save_json(args.baseline, result)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if args.compare:
+        baseline = load_json(args.compare)
+        regressions = compare(result, baseline, args.tolerance)
+        if regressions:
+            print(f"\nFAILED: {len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"\nOK: within {args.tolerance:.0%} of baseline {args.compare}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load benchmark for the SDS Chemical Inventory API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds before recording")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Weighted operation mix (default: {DEFAULT_MIX})")
+    parser.add_argument("--chemicals", type=int, default=100, help="Chemicals to seed for the run")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="Write this run's results to a JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the baseline")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline path for --save-baseline")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression (0.15 = 15%%)")
+    parser.add_argument("--keep-data", action="store_true", help="Do not delete seeded chemicals")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
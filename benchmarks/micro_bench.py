@@ -0,0 +1,357 @@
+"""In-process micro-benchmarks for hot request-path code.
+
+Pure functions (serialization, pagination, schema validation, log row
+post-processing) are timed directly. Database-bound pieces (`log_operation`
+and the read endpoints driven through `app.main.app` over an in-memory ASGI
+transport) run against a seeded local PostgreSQL configured via the usual
+DATABASE_* settings; pass --skip-db to time only the pure functions.
+
+    python -m benchmarks.micro_bench run --output /tmp/head.json
+    python -m benchmarks.micro_bench compare /tmp/base.json /tmp/head.json
+    python -m benchmarks.micro_bench revs origin/main HEAD
+"""
+import argparse
+import asyncio
+import gc
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.common import load_json, run_metadata, save_json
+
+REPO_ROOT = Path(__file__).parent.parent
+SEED_PREFIX = "MICROBENCH-"
+
+
+class Timer:
+    """Repeatable timing: warm-up, GC disabled, median of several rounds"""
+
+    def __init__(self, rounds: int, min_round_time: float):
+        self.rounds = rounds
+        self.min_round_time = min_round_time
+        self.results: Dict[str, Dict] = {}
+
+    def _calibrate(self, run_batch: Callable[[int], float]) -> int:
+        number = 1
+        while True:
+            if run_batch(number) >= self.min_round_time or number >= 1_000_000:
+                return number
+            number *= 2
+
+    def _record(self, name: str, number: int, timings: List[float]):
+        per_op = sorted(t / number * 1e6 for t in timings)
+        self.results[name] = {
+            "iterations": number,
+            "rounds": len(per_op),
+            "median_us": round(statistics.median(per_op), 4),
+            "min_us": round(per_op[0], 4),
+            "stdev_us": round(statistics.stdev(per_op), 4) if len(per_op) > 1 else 0.0,
+        }
+        print(f"{name:<40} {self.results[name]['median_us']:>12.3f} us/op  "
+              f"(min {per_op[0]:.3f}, {number} x {len(per_op)})")
+
+    def bench(self, name: str, func: Callable[[], object]):
+        def run_batch(number: int) -> float:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            return time.perf_counter() - start
+
+        number = self._calibrate(run_batch)
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            timings = [run_batch(number) for _ in range(self.rounds)]
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        self._record(name, number, timings)
+
+    async def bench_async(self, name: str, func: Callable[[], object]):
+        async def run_batch(number: int) -> float:
+            start = time.perf_counter()
+            for _ in range(number):
+                await func()
+            return time.perf_counter() - start
+
+        number = 1
+        while number < 10_000:
+            if await run_batch(number) >= self.min_round_time:
+                break
+            number *= 2
+        timings = [await run_batch(number) for _ in range(self.rounds)]
+        self._record(name, number, timings)
+
+
+def sample_chemical(i: int = 1):
+    from app.models import Chemical
+
+    now = datetime.now(timezone.utc)
+    chemical = Chemical(
+        id=i,
+        name=f"Ethanol {i}",
+        cas_number=f"64-17-{i}",
+        quantity=500.0 + i,
+        unit="ml",
+        created_at=now,
+        updated_at=now
+    )
+    # Older revisions benchmarked through `revs` have no version column
+    if hasattr(Chemical, "version"):
+        chemical.version = 1
+    return chemical
+
+
+def sample_log_rows(count: int) -> List[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {"id": i, "chemical_id": 1, "action_type": "ADD" if i % 2 else "REMOVE", "quantity": 1.5, "timestamp": now}
+        for i in range(count)
+    ]
+
+
+def run_pure_benchmarks(timer: Timer):
+    from app.api import schemas
+    from app.services.audit_service import AuditService
+
+    chemical = sample_chemical()
+    timer.bench("serialize_model", lambda: AuditService.serialize_model(chemical))
+
+    payload = {"name": "Ethanol", "cas_number": "64-17-5", "quantity": 500.0, "unit": "ml"}
+    timer.bench("schema.ChemicalCreate.validate", lambda: schemas.ChemicalCreate.model_validate(payload))
+
+    page_model = schemas.PaginatedResponse[schemas.Chemical]
+    chemicals = [sample_chemical(i) for i in range(20)]
+    try:
+        from app.api.pagination import build_page, normalize_pagination
+    except ImportError:
+        print(f"{'pagination.build_page':<40} {'n/a':>12}")
+    else:
+        timer.bench("pagination.normalize", lambda: normalize_pagination(3, 20))
+        timer.bench("pagination.build_page", lambda: build_page(chemicals, 1234, 3, 20))
+        page = build_page(chemicals, 1234, 3, 20)
+        timer.bench("schema.PaginatedResponse[20].validate", lambda: page_model.model_validate(page))
+
+    try:
+        from app.api.chemicals import normalize_log_rows
+    except ImportError:
+        print(f"{'normalize_log_rows[100]':<40} {'n/a':>12}")
+    else:
+        rows = sample_log_rows(100)
+        timer.bench("normalize_log_rows[100]", lambda: normalize_log_rows(rows))
+
+
+async def seed_database(chemicals: int, logs_per_chemical: int) -> List[int]:
+    from sqlalchemy import insert
+    from app.db.base import AsyncSessionLocal
+    from app.models import Chemical, InventoryLog, ActionType
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            insert(Chemical).returning(Chemical.id),
+            [
+                {"name": f"Bench {i}", "cas_number": f"{SEED_PREFIX}{os.getpid()}-{i}", "quantity": 100.0, "unit": "ml"}
+                for i in range(chemicals)
+            ]
+        )
+        ids = [row[0] for row in result]
+        await db.execute(
+            insert(InventoryLog),
+            [
+                {"chemical_id": chemical_id, "action_type": ActionType.ADD, "quantity": 1.0}
+                for chemical_id in ids
+                for _ in range(logs_per_chemical)
+            ]
+        )
+        await db.commit()
+    return ids
+
+
+async def cleanup_database():
+    from sqlalchemy import delete, select
+    from app.db.base import AsyncSessionLocal
+    from app.models import AuditLog, Chemical, InventoryLog
+
+    async with AsyncSessionLocal() as db:
+        seeded = select(Chemical.id).where(Chemical.cas_number.like(f"{SEED_PREFIX}%"))
+        await db.execute(delete(InventoryLog).where(InventoryLog.chemical_id.in_(seeded)))
+        await db.execute(delete(AuditLog).where(AuditLog.user_info == "microbench"))
+        await db.execute(delete(Chemical).where(Chemical.cas_number.like(f"{SEED_PREFIX}%")))
+        await db.commit()
+
+
+async def run_db_benchmarks(timer: Timer, chemicals: int, logs_per_chemical: int):
+    import httpx
+    from app.db.base import AsyncSessionLocal, engine
+    from app.main import app
+    from app.services.audit_service import AuditService
+
+    ids = await seed_database(chemicals, logs_per_chemical)
+    try:
+        chemical = sample_chemical(ids[0])
+        values = AuditService.serialize_model(chemical)
+
+        async with AsyncSessionLocal() as db:
+            async def log_operation():
+                await AuditService.log_operation(
+                    db=db,
+                    table_name="chemicals",
+                    operation="UPDATE",
+                    record_id=ids[0],
+                    old_values=values,
+                    new_values=values,
+                    user_info="microbench"
+                )
+
+            await timer.bench_async("AuditService.log_operation", log_operation)
+            await db.rollback()
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def get_chemical():
+                response = await client.get(f"/api/v1/chemicals/{ids[0]}")
+                response.raise_for_status()
+
+            async def list_chemicals():
+                response = await client.get("/api/v1/chemicals/", params={"page": 2, "page_size": 20})
+                response.raise_for_status()
+
+            async def read_logs():
+                response = await client.get(f"/api/v1/chemicals/{ids[0]}/logs", params={"page_size": 50})
+                response.raise_for_status()
+
+            await timer.bench_async("asgi GET /chemicals/{id}", get_chemical)
+            await timer.bench_async("asgi GET /chemicals/", list_chemicals)
+            await timer.bench_async("asgi GET /chemicals/{id}/logs", read_logs)
+    finally:
+        await cleanup_database()
+        await engine.dispose()
+
+
+def run(args) -> int:
+    # SQL echo would dominate every timing
+    import logging
+    logging.disable(logging.WARNING)
+
+    timer = Timer(rounds=args.rounds, min_round_time=args.min_round_time)
+    run_pure_benchmarks(timer)
+    if not args.skip_db:
+        asyncio.run(run_db_benchmarks(timer, args.chemicals, args.logs))
+
+    if args.output:
+        save_json(args.output, {
+            "meta": run_metadata(rounds=args.rounds, skip_db=args.skip_db),
+            "benchmarks": timer.results
+        })
+        print(f"\nResults saved to {args.output}")
+    return 0
+
+
+def compare_results(base: Dict, head: Dict, threshold: float) -> int:
+    base_label = base["meta"].get("git_revision") or "base"
+    head_label = head["meta"].get("git_revision") or "head"
+    print(f"{'benchmark':<40} {base_label:>12} {head_label:>12} {'change':>9}")
+    print("-" * 76)
+
+    regressions = 0
+    for name in sorted(set(base["benchmarks"]) | set(head["benchmarks"])):
+        old = base["benchmarks"].get(name, {}).get("median_us")
+        new = head["benchmarks"].get(name, {}).get("median_us")
+        if old is None or new is None:
+            print(f"{name:<40} {old if old is not None else 'n/a':>12} {new if new is not None else 'n/a':>12}")
+            continue
+
+        change = (new - old) / old if old else 0.0
+        marker = ""
+        if change > threshold:
+            marker = "  SLOWER"
+            regressions += 1
+        elif change < -threshold:
+            marker = "  faster"
+        print(f"{name:<40} {old:>12.3f} {new:>12.3f} {change:>+9.1%}{marker}")
+    return 1 if regressions else 0
+
+
+def compare(args) -> int:
+    return compare_results(load_json(args.base), load_json(args.head), args.threshold)
+
+
+def run_at_revision(rev: str, output: Path, passthrough: List[str]):
+    """Run this harness against another revision checked out in a temporary worktree"""
+    worktree = Path(tempfile.mkdtemp(prefix="microbench-"))
+    try:
+        subprocess.run(["git", "worktree", "add", "--detach", str(worktree), rev], cwd=REPO_ROOT, check=True)
+        # Always use the current harness so every revision is measured the same way
+        shutil.rmtree(worktree / "benchmarks", ignore_errors=True)
+        shutil.copytree(REPO_ROOT / "benchmarks", worktree / "benchmarks")
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.micro_bench", "run", "--output", str(output)] + passthrough,
+            cwd=worktree,
+            check=True
+        )
+        data = load_json(output)
+        data["meta"]["git_revision"] = rev
+        save_json(output, data)
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", str(worktree)], cwd=REPO_ROOT)
+        shutil.rmtree(worktree, ignore_errors=True)
+
+
+def revs(args) -> int:
+    passthrough = ["--rounds", str(args.rounds), "--min-round-time", str(args.min_round_time)]
+    if args.skip_db:
+        passthrough.append("--skip-db")
+
+    out_dir = Path(tempfile.mkdtemp(prefix="microbench-results-"))
+    base_out, head_out = out_dir / "base.json", out_dir / "head.json"
+    print(f"=== {args.base} ===")
+    run_at_revision(args.base, base_out, passthrough)
+    print(f"\n=== {args.head} ===")
+    run_at_revision(args.head, head_out, passthrough)
+    print()
+    return compare_results(load_json(base_out), load_json(head_out), args.threshold)
+
+
+def add_run_options(parser: argparse.ArgumentParser):
+    parser.add_argument("--rounds", type=int, default=7, help="Timed rounds per benchmark (median reported)")
+    parser.add_argument("--min-round-time", type=float, default=0.2, help="Minimum seconds per round")
+    parser.add_argument("--skip-db", action="store_true", help="Only run benchmarks that need no database")
+    parser.add_argument("--threshold", type=float, default=0.05, help="Relative change reported as a regression")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the SDS Chemical Inventory API")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Run the benchmarks in this checkout")
+    add_run_options(run_parser)
+    run_parser.add_argument("--chemicals", type=int, default=200, help="Chemicals to seed")
+    run_parser.add_argument("--logs", type=int, default=50, help="Inventory logs to seed per chemical")
+    run_parser.add_argument("--output", help="Write results JSON here")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = sub.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--threshold", type=float, default=0.05)
+    compare_parser.set_defaults(func=compare)
+
+    revs_parser = sub.add_parser("revs", help="Run at two git revisions and compare")
+    revs_parser.add_argument("base")
+    revs_parser.add_argument("head", nargs="?", default="HEAD")
+    add_run_options(revs_parser)
+    revs_parser.set_defaults(func=revs)
+
+    args = parser.parse_args(argv)
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
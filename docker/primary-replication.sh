@@ -0,0 +1,9 @@
+#!/bin/sh
+# Runs once when the primary's data directory is initialised: allow the
+# streaming replica started by docker-compose.replicas.yml to connect.
+set -e
+
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" \
+    -c "CREATE ROLE replicator WITH REPLICATION LOGIN PASSWORD 'replicator'"
+
+echo "host replication replicator all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -9,21 +9,41 @@ done
 
 echo "Database is ready!"
 
-echo "Running Alembic migrations..."
-# Try to upgrade to latest, if multiple heads exist, just continue
-alembic upgrade head || echo "Migration might have multiple heads, continuing..."
+# Deploy jobs can run `python -m app.db.migrate` once and set MIGRATE_ON_START=false;
+# otherwise this is a single revision query when the schema is already current
+if [ "${MIGRATE_ON_START:-true}" = "true" ]; then
+    python -m app.db.migrate
+fi
 
-# Ensure audit_logs table exists
-python -c "
-from app.db.base import Base, engine
-from app.models import AuditLog
-import asyncio
-async def create_tables():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-asyncio.run(create_tables())
-print('Tables verified/created')
-" || echo "Table creation handled"
+# Usable CPUs, honouring a cgroup v2 CPU quota (docker --cpus) when one is set
+default_workers() {
+    local cpus
+    cpus=$(nproc)
+    if [ -r /sys/fs/cgroup/cpu.max ]; then
+        read -r quota period < /sys/fs/cgroup/cpu.max
+        if [ "$quota" != "max" ]; then
+            local limit=$(( (quota + period - 1) / period ))
+            if [ "$limit" -lt "$cpus" ]; then
+                cpus=$limit
+            fi
+        fi
+    fi
+    echo "$cpus"
+}
+
+if [ "${SERVER_MODE:-development}" = "production" ]; then
+    WORKERS=${WEB_CONCURRENCY:-$(default_workers)}
+    export SQL_ECHO=${SQL_ECHO:-false}
+    # One set of rotating log files per worker process
+    export LOG_FILES_PER_WORKER=${LOG_FILES_PER_WORKER:-true}
+    export DB_POOL_WARM_CONNECTIONS=${DB_POOL_WARM_CONNECTIONS:-${DB_POOL_SIZE:-5}}
+    echo "Starting FastAPI application (production, $WORKERS workers)..."
+    # exec so SIGTERM reaches uvicorn, which drains in-flight requests before
+    # each worker's lifespan shutdown flushes the log batcher and audit files
+    exec uvicorn app.main:app --host 0.0.0.0 --port 8000 \
+        --workers "$WORKERS" \
+        --timeout-graceful-shutdown "${GRACEFUL_SHUTDOWN_TIMEOUT:-30}"
+fi
 
 echo "Starting FastAPI application..."
-uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
+exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
@@ -80,13 +80,137 @@ def test_api():
     print("8. Deleting chemical...")
     response = requests.delete(f"{BASE_URL}/api/v1/chemicals/{chemical_id}")
     assert response.status_code == 204, f"Delete failed: {response.status_code}"
-    print("   OK: Chemical deleted\n")
+    job_url = response.headers.get("Location")
+    assert job_url, "Delete did not return the purge job's Location"
+    print(f"   OK: Chemical deleted, purge job at {job_url}\n")
     
-    # Test 9: Verify Deletion
+    # Test 9: Verify Deletion and the Purge Job
     print("9. Verifying deletion...")
+    # The chemical is gone as soon as the DELETE returns, whether or not the purge has run
     response = requests.get(f"{BASE_URL}/api/v1/chemicals/{chemical_id}")
     assert response.status_code == 404, f"Expected 404 after deletion, got: {response.status_code}"
-    print("   OK: Deletion confirmed\n")
+    response = requests.get(f"{BASE_URL}{job_url}")
+    assert response.status_code == 200, f"Get purge job failed: {response.status_code}"
+    job = response.json()
+    assert job["chemical_id"] == chemical_id, f"Purge job is for chemical {job['chemical_id']}"
+    assert job["status"] in ("pending", "running", "completed"), f"Unexpected purge status: {job['status']}"
+    if job["status"] != "completed":
+        response = requests.get(f"{BASE_URL}/api/v1/chemicals/{chemical_id}")
+        assert response.status_code == 404, f"Expected 404 while purging, got: {response.status_code}"
+    print(f"   OK: Deletion confirmed, purge job {job['id']} is {job['status']}\n")
+    
+    # Test 10: Bulk Update with a CAS Conflict
+    print("10. Bulk updating chemicals...")
+    other_ids = []
+    for suffix in ("A", "B"):
+        response = requests.post(f"{BASE_URL}/api/v1/chemicals/", json={
+            "name": f"Acetone {suffix}",
+            "cas_number": f"{unique_cas}-{suffix}",
+            "quantity": 1.0,
+            "unit": "l"
+        })
+        assert response.status_code == 200, f"Create failed: {response.status_code}"
+        other_ids.append(response.json()["id"])
+    first_id, second_id = other_ids
+    bulk_data = {"items": [
+        {"id": first_id, "quantity": 42.0},
+        {"id": second_id, "cas_number": f"{unique_cas}-A"},
+        {"id": 99999, "quantity": 1.0}
+    ]}
+    response = requests.patch(f"{BASE_URL}/api/v1/chemicals/bulk", json=bulk_data)
+    assert response.status_code == 200, f"Bulk update failed: {response.status_code}"
+    data = response.json()
+    assert [item["id"] for item in data["updated"]] == [first_id], f"Unexpected updates: {data['updated']}"
+    assert data["updated"][0]["quantity"] == 42.0, "Bulk update did not apply the quantity"
+    assert data["not_found"] == [99999], f"Unexpected not_found: {data['not_found']}"
+    assert [(c["id"], c["field"]) for c in data["conflicts"]] == [(second_id, "cas_number")], \
+        f"Unexpected conflicts: {data['conflicts']}"
+    print(f"   OK: Updated {len(data['updated'])}, not found {data['not_found']}, "
+          f"conflicts on {[c['id'] for c in data['conflicts']]}\n")
+    
+    # Test 11: Conditional Update (If-Match / 412)
+    print("11. Testing conditional update with If-Match...")
+    response = requests.get(f"{BASE_URL}/api/v1/chemicals/{first_id}")
+    assert response.status_code == 200, f"Get by ID failed: {response.status_code}"
+    stale_etag = response.headers["ETag"]
+    response = requests.put(f"{BASE_URL}/api/v1/chemicals/{first_id}", json={"quantity": 40.0},
+                            headers={"If-Match": stale_etag})
+    assert response.status_code == 200, f"Conditional update failed: {response.status_code}"
+    current_etag = response.headers["ETag"]
+    assert current_etag != stale_etag, "ETag did not change after the update"
+    response = requests.put(f"{BASE_URL}/api/v1/chemicals/{first_id}", json={"quantity": 30.0},
+                            headers={"If-Match": stale_etag})
+    assert response.status_code == 412, f"Expected 412, got: {response.status_code}"
+    assert response.headers["ETag"] == current_etag, "412 did not report the current ETag"
+    print(f"   OK: Stale ETag {stale_etag} rejected with 412, current ETag {current_etag}\n")
+    
+    # Test 12: Multi-get by ID and CAS Number
+    print("12. Looking up chemicals by ID and CAS number...")
+    lookup_data = {
+        "ids": [second_id, first_id, chemical_id],
+        "cas_numbers": [f"{unique_cas}-B", "NO-SUCH-CAS"]
+    }
+    response = requests.post(f"{BASE_URL}/api/v1/chemicals/lookup", json=lookup_data)
+    assert response.status_code == 200, f"Lookup failed: {response.status_code}"
+    data = response.json()
+    # Request order, each chemical once; the chemical deleted in test 8 is missing
+    assert [item["id"] for item in data["items"]] == [second_id, first_id], f"Unexpected items: {data['items']}"
+    assert data["missing_ids"] == [chemical_id], f"Unexpected missing_ids: {data['missing_ids']}"
+    assert data["missing_cas_numbers"] == ["NO-SUCH-CAS"], \
+        f"Unexpected missing_cas_numbers: {data['missing_cas_numbers']}"
+    print(f"   OK: Found {len(data['items'])}, missing ids {data['missing_ids']}, "
+          f"missing CAS numbers {data['missing_cas_numbers']}\n")
+    
+    # Test 13: Get Many by ID as One Page
+    print("13. Getting chemicals by a list of IDs...")
+    response = requests.get(f"{BASE_URL}/api/v1/chemicals/",
+                            params={"ids": f"{second_id},{first_id},{chemical_id}"})
+    assert response.status_code == 200, f"Get by IDs failed: {response.status_code}"
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [second_id, first_id], f"Unexpected items: {data['items']}"
+    assert data["total_count"] == 2, f"Expected 2 chemicals, got: {data['total_count']}"
+    print(f"   OK: Found {data['total_count']} chemical(s) in request order\n")
+    
+    # Test 14: Idempotency-Key Replay, Reuse and Failure
+    print("14. Testing Idempotency-Key...")
+    key = f"{unique_cas}-create"
+    replay_data = {"name": "Methanol", "cas_number": f"{unique_cas}-C", "quantity": 2.0, "unit": "l"}
+    response = requests.post(f"{BASE_URL}/api/v1/chemicals/", json=replay_data, headers={"Idempotency-Key": key})
+    assert response.status_code == 200, f"Keyed create failed: {response.status_code}"
+    created = response.json()
+    other_ids.append(created["id"])
+    response = requests.post(f"{BASE_URL}/api/v1/chemicals/", json=replay_data, headers={"Idempotency-Key": key})
+    assert response.status_code == 200, f"Replay failed: {response.status_code}"
+    assert response.json() == created, f"Replay returned a different response: {response.json()}"
+    response = requests.post(f"{BASE_URL}/api/v1/chemicals/", json={**replay_data, "quantity": 3.0},
+                             headers={"Idempotency-Key": key})
+    assert response.status_code == 422, f"Expected 422 for a reused key, got: {response.status_code}"
+    # A failed request stores nothing, so its key still works with another body
+    key = f"{unique_cas}-log"
+    response = requests.post(f"{BASE_URL}/api/v1/chemicals/{chemical_id}/log", json=log_data,
+                             headers={"Idempotency-Key": key})
+    assert response.status_code == 404, f"Expected 404 for the deleted chemical, got: {response.status_code}"
+    response = requests.post(f"{BASE_URL}/api/v1/chemicals/{first_id}/log", json=log_data,
+                             headers={"Idempotency-Key": key})
+    assert response.status_code == 200, f"Key of a failed request was not reusable: {response.status_code}"
+    print(f"   OK: Replayed chemical {created['id']}, reused key rejected with 422, failed key reusable\n")
+    
+    # Test 15: Inventory Summary Report
+    print("15. Getting the inventory summary...")
+    response = requests.get(f"{BASE_URL}/api/v1/reports/summary", params={"top": 3})
+    assert response.status_code == 200, f"Get summary failed: {response.status_code}"
+    data = response.json()
+    assert data["chemical_count"] >= 0, f"Unexpected chemical_count: {data['chemical_count']}"
+    assert len(data["top_movers_7d"]) <= 3, f"Expected at most 3 movers, got: {len(data['top_movers_7d'])}"
+    print(f"   OK: {data['chemical_count']} chemical(s) as of {data['refreshed_at']}, "
+          f"{data['low_stock_count']} low on stock\n")
+    
+    # Test 16: Clean Up
+    print("16. Deleting the bulk test chemicals...")
+    for other_id in other_ids:
+        response = requests.delete(f"{BASE_URL}/api/v1/chemicals/{other_id}")
+        assert response.status_code == 204, f"Delete failed: {response.status_code}"
+    print("   OK: Chemicals deleted\n")
     
     print("=== All tests passed! SUCCESS: ===")
 
@@ -0,0 +1,58 @@
+"""Route class limiter shedding; runs without a database"""
+import asyncio
+
+import pytest
+
+from app.core.admission import RouteClassLimiter, Shed
+
+
+def test_full_queue_sheds_at_once():
+    async def scenario():
+        limiter = RouteClassLimiter("writes", limit=1, queue_size=1, deadline=5)
+        await limiter.acquire()
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(Shed) as shed:
+            await limiter.acquire()
+        assert shed.value.reason == "queue_full"
+
+        limiter.release(0.01)
+        await waiting
+        assert limiter.in_flight == 1
+        assert limiter.shed == {"queue_full": 1, "deadline": 0, "timeout": 0}
+
+    asyncio.run(scenario())
+
+
+def test_waiter_sheds_when_the_deadline_passes():
+    async def scenario():
+        limiter = RouteClassLimiter("reads", limit=1, queue_size=4, deadline=0.05)
+        await limiter.acquire()
+
+        with pytest.raises(Shed) as shed:
+            await limiter.acquire()
+        assert shed.value.reason == "timeout"
+        assert shed.value.retry_after >= 1
+
+        # The timed-out waiter gave up its place, so the slot is not handed to it
+        limiter.release(0.01)
+        assert limiter.in_flight == 0
+        assert limiter.stats()["waiting"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_estimated_wait_over_the_deadline_sheds_without_queueing():
+    async def scenario():
+        limiter = RouteClassLimiter("exports", limit=1, queue_size=4, deadline=1)
+        await limiter.acquire()
+        limiter.release(3.0)
+        await limiter.acquire()
+
+        with pytest.raises(Shed) as shed:
+            await limiter.acquire()
+        assert shed.value.reason == "deadline"
+        assert limiter.queued == 0
+
+    asyncio.run(scenario())
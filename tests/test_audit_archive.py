@@ -0,0 +1,57 @@
+"""Archive file bookkeeping; runs without a database"""
+from datetime import datetime, timedelta, timezone
+
+from app.services.audit_archive import AuditArchive
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_rows(ids, record_id=1):
+    return [
+        {
+            "id": row_id,
+            "table_name": "chemicals",
+            "operation": "UPDATE",
+            "record_id": record_id,
+            "old_values": None,
+            "new_values": {"quantity": row_id},
+            "timestamp": START + timedelta(seconds=second),
+            "user_info": None,
+        }
+        for second, row_id in enumerate(ids)
+    ]
+
+
+def test_interleaved_chunks_keep_all_rows(tmp_path):
+    # Concurrent writers commit id 15 before ids 10-14, so chunks cut in
+    # timestamp order overlap in their id ranges
+    archive = AuditArchive(tmp_path)
+    archive.write_chunk(make_rows([1, 2, 3, 4, 5, 6, 7, 8, 9, 15]))
+    rows = make_rows([10, 11, 12, 13, 14, 16, 17, 18, 19, 20])
+    for row in rows:
+        row["timestamp"] += timedelta(minutes=1)
+    archive.write_chunk(rows)
+
+    assert len(archive.index()) == 2
+    assert archive.count_for_record(1) == 20
+    assert sorted(row["id"] for row in archive.rows_for_record(1, 0, 100)) == list(range(1, 21))
+
+
+def test_retried_chunk_replaces_its_first_attempt(tmp_path):
+    archive = AuditArchive(tmp_path)
+    archive.write_chunk(make_rows([1, 2, 3]))
+    # The retry also picks up rows that aged past the cutoff in between
+    archive.write_chunk(make_rows([1, 2, 3, 4, 5]))
+
+    assert len(archive.index()) == 1
+    assert archive.count_for_record(1) == 5
+    assert len(list(tmp_path.glob("2024/01/*"))) == 1
+
+
+def test_rows_for_record_skips_excluded_ids(tmp_path):
+    archive = AuditArchive(tmp_path)
+    archive.write_chunk(make_rows([1, 2, 3, 4]))
+
+    rows = archive.rows_for_record(1, 1, 10, exclude={3})
+    assert [row["id"] for row in rows] == [2, 1]
+    assert archive.ids_for_record(1) == {1, 2, 3, 4}
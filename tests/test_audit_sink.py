@@ -0,0 +1,27 @@
+"""Ownership of uncompressed audit segments; runs without a database"""
+import os
+from pathlib import Path
+
+from app.core.audit_sink import _process_start, _writer_alive
+
+
+def segment(pid, started):
+    return Path(f"audit-20260101T000000Z-{pid}-{started}-000001.ndjson")
+
+
+def test_live_writer_owns_its_segment():
+    parent = os.getppid()
+    assert _writer_alive(segment(parent, _process_start(parent)))
+
+
+def test_reused_pid_does_not_own_the_segment():
+    # Same pid after a restart, but a process that started at another time
+    parent = os.getppid()
+    started = _process_start(parent)
+    if not started:
+        return
+    assert not _writer_alive(segment(parent, started + 1))
+
+
+def test_own_segments_are_not_foreign_writers():
+    assert not _writer_alive(segment(os.getpid(), _process_start(os.getpid())))